@@ -2,17 +2,30 @@
 
 from __future__ import annotations
 
-import json
+import atexit
+import functools
+import gzip
+import itertools
+import operator
 import os
+import queue
+import re
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterator
 
-import altair as alt
 import httpx
+import orjson
 import streamlit as st
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
@@ -23,13 +36,15 @@ from src.ui_utils import (
     condense_trace_timeline,
     extract_diagnosis_metrics,
     find_switch_event,
+    first_and_last_tutor_messages,
+    summarize_agent_activity,
 )
 
 DATA_DIR = ROOT_DIR / "data"
 LEGACY_STATE_PATH = DATA_DIR / "state.json"
 AGENT_TRACE_PATH = ROOT_DIR / "data" / "agent_traces.json"
 SUBMISSION_HISTORY_PATH = DATA_DIR / "submission_history.json"
-TRACE_STORE = TraceStore(AGENT_TRACE_PATH)
+RUN_LOG_DIR = DATA_DIR / "runs"
 DEFAULT_BASE_URL = "https://knowunity-agent-olympics-2026-api.vercel.app"
 DEFAULT_DEV_STUDENTS = [
     {
@@ -48,67 +63,321 @@ DEFAULT_DEV_STUDENTS = [
         "grade_level": 11,
     },
 ]
-DEFAULT_DEV_STUDENT_ALLOWLIST = {student["id"] for student in DEFAULT_DEV_STUDENTS}
+DEFAULT_DEV_STUDENT_ALLOWLIST = frozenset(student["id"] for student in DEFAULT_DEV_STUDENTS)
 RUN_TURNS = 10
 RUN_MAX_CONVOS = 3
 RUN_PARALLEL = 3
+API_CACHE_TTL = 300
+API_CONNECT_TIMEOUT = 5.0
+STATUS_UPDATE_INTERVAL = 0.25
+PUMP_POLL_INTERVAL = 0.1
+CHAT_REFRESH_INTERVAL = 0.5
+RUN_HEARTBEAT_INTERVAL = 1.0
+PROCESS_STOP_TIMEOUT = 5.0
+# Child output is read unbuffered (bufsize=0) in PIPE_READ_SIZE chunks with
+# os.read and split into lines in bulk, rather than line-buffered readline().
+# The child runs with PYTHONUNBUFFERED=1 (the Docker image sets it too) so log
+# lines reach the pipe as they are written instead of in 8 KiB bursts.
+PIPE_READ_SIZE = 1 << 16
+PIPE_BUFFER_SIZE = 1 << 20
+PUMP_QUEUE_LIMIT = 64
+RUN_LOG_LIMIT = 2000
+RUN_LOG_TAIL_LINES = 200
+STATE_PARSE_WORKERS = 8
+# "Shot Clock" and "Confidence Gate" are not identifier-like, so CPython does
+# not intern them automatically.
+AGENT_NAMES = tuple(
+    map(sys.intern, ("Opener", "Detective", "Tutor", "Shot Clock", "Confidence Gate"))
+)
+RUN_EVENT_TOKENS = (
+    "Config:",
+    "Found ",
+    "Starting:",
+    "[Turn 0]",
+    "[DIAGNOSIS Turn",
+    "[TUTORING Turn",
+    ">>>",
+    "=== Session Complete",
+    "Saved ",
+    "Reached max conversations limit",
+)
+CHAT_REFRESH_TOKENS = (
+    "[Turn 0] Tutor:",
+    "[Turn 0] Student:",
+    "[DIAGNOSIS Turn",
+    "[TUTORING Turn",
+    "[Student Response]:",
+    "Saved ",
+)
+# Client request logs are never shown as run events.
+HTTP_NOISE_PATTERN = re.compile(rb"HTTP Request:|(?i:httpx)")
+# Only "Starting: <topic>" events name their topic.
+RUN_EVENT_TOPIC_PATTERN = re.compile(r"Starting:\s*(.+?)\s*$")
+RUN_TOKEN_EVENT = 1
+RUN_TOKEN_CHAT = 2
+
+
+def build_run_token_scanner(
+    event_tokens: tuple[str, ...], chat_tokens: tuple[str, ...]
+) -> tuple[re.Pattern[bytes], dict[bytes, int]]:
+    """Compile both token lists into one bytes alternation plus a flag table.
+
+    Tokens are tried longest first, and each token's flags include those of any
+    shorter token it contains, so "[Turn 0] Tutor:" also counts as a "[Turn 0]"
+    run event.
+    """
+    tokens = sorted(dict.fromkeys(event_tokens + chat_tokens), key=len, reverse=True)
+    flags: dict[bytes, int] = {}
+    for token in tokens:
+        token_flags = 0
+        if any(other in token for other in event_tokens):
+            token_flags |= RUN_TOKEN_EVENT
+        if any(other in token for other in chat_tokens):
+            token_flags |= RUN_TOKEN_CHAT
+        flags[token.encode()] = token_flags
+    pattern = re.compile(b"|".join(re.escape(token.encode()) for token in tokens))
+    return pattern, flags
+
+
+# One scan per raw log line classifies it; lines with no token are never decoded.
+RUN_TOKEN_PATTERN, RUN_TOKEN_FLAGS = build_run_token_scanner(
+    RUN_EVENT_TOKENS, CHAT_REFRESH_TOKENS
+)
 
 
 def init_state() -> None:
     """Initialize Streamlit session state keys."""
     st.session_state.setdefault("run_logs", {})
+    st.session_state.setdefault("run_log_tail", {})
     st.session_state.setdefault("agent_traces", {})
+    st.session_state.setdefault("agent_trace_version", (0, 0, 0))
     st.session_state.setdefault("last_status", {})
     st.session_state.setdefault("run_events", {})
+    st.session_state.setdefault("run_events_by_topic", {})
     st.session_state.setdefault("run_state", {})
+    st.session_state.setdefault("entries_memo", (None, []))
+
+
+@st.cache_resource(show_spinner=False)
+def get_trace_store() -> TraceStore:
+    """Return the shared agent trace store."""
+    return TraceStore(AGENT_TRACE_PATH)
+
+
+@st.cache_resource(show_spinner=False)
+def get_trace_cursor() -> dict[str, Any]:
+    """Shared view of the trace store: snapshot version, journal offset, traces."""
+    return {"lock": threading.Lock(), "snapshot": None, "offset": 0, "traces": {}}
 
 
 def hydrate_agent_traces() -> None:
-    """Load persisted agent traces into session state."""
-    st.session_state["agent_traces"] = TRACE_STORE.load()
+    """Load persisted agent traces into session state.
+
+    Only journal lines appended since the last hydrate are parsed, and the
+    journal is not opened at all while its size is unchanged. The snapshot
+    is reloaded when it changes or the journal shrinks (after a compaction).
+    New events are merged copy-on-write, since other sessions may still be
+    rendering the previous traces dict.
+    """
+    store = get_trace_store()
+    cursor = get_trace_cursor()
+    with cursor["lock"]:
+        snapshot = trace_store_version()
+        try:
+            journal_size = store.journal_path.stat().st_size
+        except FileNotFoundError:
+            journal_size = 0
+        if snapshot != cursor["snapshot"] or journal_size < cursor["offset"]:
+            cursor.update(snapshot=snapshot, offset=0, traces=store.load_snapshot())
+        # An unchanged journal costs a stat per rerun, not an open and read.
+        if journal_size > cursor["offset"]:
+            records, offset = store.load_since(cursor["offset"])
+            if records:
+                traces = dict(cursor["traces"])
+                for student_id, events in records:
+                    traces[student_id] = [*traces.get(student_id, ()), *events]
+                cursor["traces"] = traces
+            cursor["offset"] = offset
+        offset = cursor["offset"]
+        st.session_state["agent_trace_version"] = (*snapshot, offset)
+        st.session_state["agent_traces"] = cursor["traces"]
+
+
+def run_log_path(student_id: str) -> Path:
+    """Return the gzip archive that collects a student's full run logs."""
+    RUN_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return RUN_LOG_DIR / f"{student_id}.log.gz"
+
+
+def trace_store_version() -> tuple[int, int]:
+    """Return the agent trace snapshot (mtime_ns, size).
+
+    The size catches rewrites that land within the filesystem's mtime
+    granularity, such as a read racing a save.
+    """
+    try:
+        stat = AGENT_TRACE_PATH.stat()
+    except FileNotFoundError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
 
 
-def extract_run_event(line: str) -> str | None:
-    """Filter and normalize run log lines for UI display."""
-    if "HTTP Request:" in line or "httpx" in line.lower():
-        return None
-    cleaned = line.replace("INFO:", "", 1).replace("WARNING:", "", 1).strip()
-    keep_tokens = (
-        "Config:",
-        "Found ",
-        "Starting:",
-        "[Turn 0]",
-        "[DIAGNOSIS Turn",
-        "[TUTORING Turn",
-        ">>>",
-        "=== Session Complete",
-        "Saved ",
-        "Reached max conversations limit",
-    )
-    if any(token in cleaned for token in keep_tokens):
-        return cleaned
-    return None
-
-
-def should_refresh_chat(line: str) -> bool:
-    """Return True when log lines suggest new chat content."""
-    chat_tokens = (
-        "[Turn 0] Tutor:",
-        "[Turn 0] Student:",
-        "[DIAGNOSIS Turn",
-        "[TUTORING Turn",
-        "[Student Response]:",
-        "Saved ",
-    )
-    return any(token in line for token in chat_tokens)
+@st.cache_data(show_spinner=False, max_entries=64)
+def digest_agent_activity(
+    student_id: str,
+    trace_version: tuple[int, int, int],
+    topic_filter: str,
+    _trace: list[dict[str, str]],
+) -> tuple[dict[str, dict[str, str]], pd.DataFrame]:
+    """Summarize a student's trace; keyed on student, trace version and filter.
+
+    Returns the latest event per agent and the filtered trace as a DataFrame
+    ready for the "Full agent trace" table.
+    """
+    import pandas as pd
+
+    topic = None if topic_filter == "All" else topic_filter
+    last_by_agent, filtered = summarize_agent_activity(_trace, AGENT_NAMES, topic)
+    return last_by_agent, pd.DataFrame.from_records(filtered)
+
+
+def scan_run_tokens(raw: bytes) -> int:
+    """Return the RUN_TOKEN_* flags of every token found in a raw log line."""
+    flags = 0
+    for match in RUN_TOKEN_PATTERN.finditer(raw):
+        flags |= RUN_TOKEN_FLAGS[match.group()]
+        if flags == RUN_TOKEN_EVENT | RUN_TOKEN_CHAT:
+            break
+    return flags
+
+
+def classify_line(raw: bytes) -> tuple[str | None, bool]:
+    """Return (display event or None, whether the line signals new chat)."""
+    token_flags = scan_run_tokens(raw)
+    if not token_flags:
+        return None, False
+    is_chat = bool(token_flags & RUN_TOKEN_CHAT)
+    if not token_flags & RUN_TOKEN_EVENT or HTTP_NOISE_PATTERN.search(raw):
+        return None, is_chat
+    line = raw.decode("utf-8", "replace")
+    return line.replace("INFO:", "", 1).replace("WARNING:", "", 1).strip(), is_chat
+
+
+def record_run_event(student_id: str, event: str) -> None:
+    """Store a run event, bucketing topic-tagged events by topic name."""
+    st.session_state["run_events"][student_id].append(event)
+    match = RUN_EVENT_TOPIC_PATTERN.search(event)
+    if match:
+        st.session_state["run_events_by_topic"][student_id].setdefault(
+            match.group(1), []
+        ).append(event)
+
+
+def iter_output_batches(stream: IO[bytes]) -> Iterator[list[bytes]]:
+    """Yield the stripped raw lines completed by each large read of a binary pipe."""
+    fd = stream.fileno()
+    pending = b""
+    while True:
+        chunk = os.read(fd, PIPE_READ_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        if lines:
+            yield [raw_line.rstrip() for raw_line in lines]
+    if pending:
+        yield [pending.rstrip()]
+
+
+def pump_output(
+    stream: IO[bytes],
+    batches: queue.Queue[list[bytes] | None],
+    stop: threading.Event,
+) -> None:
+    """Forward batches of pipe lines onto a queue from a background thread.
 
+    Gives up once ``stop`` is set, so a reader that went away (a rerun or
+    stop) cannot leave this thread blocked on a full queue.
+    """
 
-def load_student_allowlist() -> set[str]:
+    def put(item: list[bytes] | None) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=PUMP_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    try:
+        for batch in iter_output_batches(stream):
+            if not put(batch):
+                return
+    finally:
+        put(None)
+
+
+def stop_process(process: subprocess.Popen[bytes]) -> None:
+    """Terminate a still-running child, killing it if it ignores SIGTERM."""
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=PROCESS_STOP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def iter_pumped_batches(stream: IO[bytes]) -> Iterator[list[bytes] | None]:
+    """Yield batches of pipe lines drained on a background thread.
+
+    Everything queued since the last call is merged into one batch, so the
+    caller updates the UI once per batch rather than once per line. ``None``
+    is yielded whenever nothing arrived within PUMP_POLL_INTERVAL, so callers
+    can refresh a heartbeat without blocking on the pipe.
+    """
+    # Bounded so a stalled UI pushes back on the child instead of buffering
+    # its whole output in memory.
+    output: queue.Queue[list[bytes] | None] = queue.Queue(maxsize=PUMP_QUEUE_LIMIT)
+    stop = threading.Event()
+    threading.Thread(target=pump_output, args=(stream, output, stop), daemon=True).start()
+    done = False
+    try:
+        while not done:
+            try:
+                batch = output.get(timeout=PUMP_POLL_INTERVAL)
+            except queue.Empty:
+                yield None
+                continue
+            if batch is None:
+                return
+            while True:
+                try:
+                    more = output.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    done = True
+                    break
+                batch.extend(more)
+            yield batch
+    finally:
+        # Runs when the caller finishes or drops the generator; releases the pump
+        stop.set()
+
+
+@functools.lru_cache(maxsize=4)
+def parse_student_allowlist(raw_ids: str) -> frozenset[str]:
+    """Parse a comma-separated ID list (cached on the raw env value)."""
+    if not raw_ids:
+        return DEFAULT_DEV_STUDENT_ALLOWLIST
+    return frozenset(entry.strip() for entry in raw_ids.split(",") if entry.strip())
+
+
+def load_student_allowlist() -> frozenset[str]:
     """Load allowlisted dev student IDs from env."""
-    raw_ids = os.getenv("DEV_STUDENT_IDS", "").strip()
-    if raw_ids:
-        return {entry.strip() for entry in raw_ids.split(",") if entry.strip()}
-    return set(DEFAULT_DEV_STUDENT_ALLOWLIST)
+    return parse_student_allowlist(os.getenv("DEV_STUDENT_IDS", "").strip())
 
 
 def load_dev_set_type() -> str:
@@ -117,14 +386,12 @@ def load_dev_set_type() -> str:
     return raw_type or "mini_dev"
 
 
-def load_dev_students_override() -> list[dict[str, Any]] | None:
-    """Load a dev student list override from env."""
-    raw_json = os.getenv("DEV_STUDENTS_JSON", "").strip()
-    if not raw_json:
-        return None
+@functools.lru_cache(maxsize=4)
+def parse_dev_students_override(raw_json: str) -> list[dict[str, Any]]:
+    """Parse a DEV_STUDENTS_JSON value (cached on the raw env value; do not mutate)."""
     try:
-        payload = json.loads(raw_json)
-    except json.JSONDecodeError as exc:
+        payload = orjson.loads(raw_json)
+    except orjson.JSONDecodeError as exc:
         raise ValueError(f"Invalid DEV_STUDENTS_JSON: {exc}") from exc
     if isinstance(payload, dict):
         return payload.get("students", [])
@@ -133,11 +400,50 @@ def load_dev_students_override() -> list[dict[str, Any]] | None:
     raise ValueError("DEV_STUDENTS_JSON must be a list or an object with 'students'.")
 
 
+def load_dev_students_override() -> list[dict[str, Any]] | None:
+    """Load a dev student list override from env."""
+    raw_json = os.getenv("DEV_STUDENTS_JSON", "").strip()
+    if not raw_json:
+        return None
+    return parse_dev_students_override(raw_json)
+
+
 def get_base_url() -> str:
     """Return the Knowunity API base URL."""
     return os.getenv("KNOWUNITY_BASE_URL", DEFAULT_BASE_URL)
 
 
+@st.cache_resource(show_spinner=False)
+def get_http_client(base_url: str) -> httpx.Client:
+    """Return a pooled HTTP client for the given API base URL."""
+    client = httpx.Client(
+        base_url=base_url,
+        # Failed fetches are not cached, so an unreachable API must fail fast
+        # rather than stall every rerun for the full read timeout.
+        timeout=httpx.Timeout(30, connect=API_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    atexit.register(client.close)
+    return client
+
+
+@st.cache_data(ttl=API_CACHE_TTL, show_spinner=False)
+def fetch_students_for_set(base_url: str, set_type: str) -> list[dict[str, Any]]:
+    """Fetch the raw student list for a set type (cached per base URL)."""
+    response = get_http_client(base_url).get("/students", params={"set_type": set_type})
+    response.raise_for_status()
+    return response.json().get("students", [])
+
+
+@st.cache_data(ttl=API_CACHE_TTL, show_spinner=False)
+def fetch_allowlisted_students(
+    base_url: str, set_type: str, allowlist: frozenset[str]
+) -> list[dict[str, Any]]:
+    """Fetch a set's students filtered to an allowlist (cached per allowlist)."""
+    students = fetch_students_for_set(base_url, set_type)
+    return [student for student in students if student.get("id") in allowlist]
+
+
 def fetch_dev_students(set_type: str | None = None, use_allowlist: bool = True) -> list[dict[str, Any]]:
     """Fetch students from the dev set."""
     override = load_dev_students_override()
@@ -145,71 +451,163 @@ def fetch_dev_students(set_type: str | None = None, use_allowlist: bool = True)
         return override
     if not set_type:
         set_type = load_dev_set_type()
-    response = httpx.get(
-        f"{get_base_url()}/students", params={"set_type": set_type}, timeout=30
-    )
-    response.raise_for_status()
-    students = response.json().get("students", [])
 
     # Only apply allowlist if explicitly requested (for backward compatibility)
     if use_allowlist:
         allowlist = load_student_allowlist()
         if allowlist:
-            students = [student for student in students if student.get("id") in allowlist]
+            students = fetch_allowlisted_students(get_base_url(), set_type, allowlist)
+        else:
+            students = fetch_students_for_set(get_base_url(), set_type)
         if not students and allowlist == DEFAULT_DEV_STUDENT_ALLOWLIST:
             return list(DEFAULT_DEV_STUDENTS)
+        return students
 
-    return students
+    return fetch_students_for_set(get_base_url(), set_type)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def index_by_id(records: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Map record IDs to records for selectbox label lookups."""
+    return {record["id"]: record for record in records}
+
+
+def student_label(student: dict[str, Any]) -> str:
+    """Format a student for the sidebar selectbox."""
+    return f"{student.get('name', student['id'])} (Grade {student.get('grade_level', '?')})"
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_student_labels(students: list[dict[str, Any]]) -> dict[str, str]:
+    """Map student IDs to sidebar labels, in list order."""
+    return {student["id"]: student_label(student) for student in students}
+
+
+@st.cache_data(ttl=API_CACHE_TTL, show_spinner=False)
+def fetch_topics_cached(base_url: str, student_id: str) -> list[dict[str, Any]]:
+    """Fetch a student's topics (cached per base URL; errors are not cached)."""
+    response = get_http_client(base_url).get(f"/students/{student_id}/topics")
+    response.raise_for_status()
+    return response.json().get("topics", [])
 
 
 def fetch_topics_for_student(student_id: str) -> list[dict[str, Any]]:
     """Fetch topics for a specific student."""
     try:
-        response = httpx.get(
-            f"{get_base_url()}/students/{student_id}/topics", timeout=30
-        )
-        response.raise_for_status()
-        return response.json().get("topics", [])
+        return fetch_topics_cached(get_base_url(), student_id)
     except httpx.HTTPError:
         return []
 
 
-def load_state(
+def state_fingerprint(
     set_type: str | None = None,
     include_legacy: bool = False,
-) -> dict[str, Any]:
-    """Load the persisted conversation state from disk."""
-    state_data: dict[str, Any] = {}
-    if include_legacy and LEGACY_STATE_PATH.exists():
+) -> tuple[tuple[str, int, int], ...]:
+    """Return (path, mtime_ns, size) for the state files read_state_files reads.
+
+    The size catches rewrites that land within the filesystem's mtime
+    granularity.
+    """
+    fingerprint: list[tuple[str, int, int]] = []
+    if include_legacy:
         try:
-            legacy = json.loads(LEGACY_STATE_PATH.read_text())
-            if isinstance(legacy, dict):
-                state_data.update(legacy)
-        except json.JSONDecodeError:
+            stat = LEGACY_STATE_PATH.stat()
+        except FileNotFoundError:
             pass
+        else:
+            fingerprint.append((str(LEGACY_STATE_PATH), stat.st_mtime_ns, stat.st_size))
     data_dir = DATA_DIR / set_type if set_type else DATA_DIR
-    if not data_dir.exists():
-        return state_data
-    for state_file in data_dir.glob("state_*.json"):
+    try:
+        with os.scandir(data_dir) as entries:
+            state_entries = sorted(
+                (
+                    entry
+                    for entry in entries
+                    if entry.name.startswith("state_") and entry.name.endswith(".json")
+                ),
+                key=operator.attrgetter("name"),
+            )
+    except FileNotFoundError:
+        state_entries = []
+    for entry in state_entries:
         try:
-            data = json.loads(state_file.read_text())
-        except json.JSONDecodeError:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        fingerprint.append((entry.path, stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+def parse_state_file(path: str) -> Any:
+    """Parse one state file, returning None if it vanished or is corrupt."""
+    try:
+        return orjson.loads(Path(path).read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def get_state_file_cache() -> dict[str, tuple[tuple[int, int], Any]]:
+    """Shared path -> ((mtime_ns, size), parsed data) cache for state files."""
+    return {}
+
+
+@st.cache_resource(show_spinner=False, ttl=API_CACHE_TTL, max_entries=8)
+def read_state_files(
+    set_type: str | None,
+    include_legacy: bool,
+    fingerprint: tuple[tuple[str, int, int], ...],
+) -> tuple[dict[str, Any], dict[str, list[dict[str, Any]]]]:
+    """Merge the state files listed in the fingerprint and index them by student.
+
+    Only files whose mtime or size changed since they were last parsed are
+    read again, and those are read on a thread pool. Returns the merged state dict and the
+    per-student entry lists, each sorted by topic name. The result is shared
+    across reruns and sessions without copying, so callers must not mutate it.
+    """
+    file_cache = get_state_file_cache()
+    stale = [
+        (path, (mtime_ns, size))
+        for path, mtime_ns, size in fingerprint
+        if file_cache.get(path, (None,))[0] != (mtime_ns, size)
+    ]
+    if len(stale) > 1:
+        with ThreadPoolExecutor(max_workers=min(STATE_PARSE_WORKERS, len(stale))) as executor:
+            parsed = list(executor.map(parse_state_file, [path for path, _ in stale]))
+    else:
+        parsed = [parse_state_file(path) for path, _ in stale]
+    for (path, stamp), data in zip(stale, parsed):
+        file_cache[path] = (stamp, data)
+
+    state_data: dict[str, Any] = {}
+    legacy_path = str(LEGACY_STATE_PATH)
+    for path, _, _ in fingerprint:
+        data = file_cache[path][1]
+        if data is None:
+            continue
+        if path == legacy_path:
+            if isinstance(data, dict):
+                state_data.update(data)
             continue
         student_id = data.get("student_id", "unknown")
         topic_id = data.get("topic_id", "unknown")
         state_data[f"{student_id}:{topic_id}"] = data
-    return state_data
+
+    by_student: dict[str, list[dict[str, Any]]] = {}
+    for entry in state_data.values():
+        entry.setdefault("topic_name", "")
+        by_student.setdefault(entry.get("student_id"), []).append(entry)
+    sort_key = operator.itemgetter("topic_name")
+    for entries in by_student.values():
+        entries.sort(key=sort_key)
+    return state_data, by_student
 
 
 def get_student_entries(
-    state_data: dict[str, Any], student_id: str
+    by_student: dict[str, list[dict[str, Any]]], student_id: str
 ) -> list[dict[str, Any]]:
-    """Collect state entries for a single student."""
-    entries: list[dict[str, Any]] = []
-    for entry in state_data.values():
-        if entry.get("student_id") == student_id:
-            entries.append(entry)
-    return sorted(entries, key=lambda item: item.get("topic_name", ""))
+    """Look up state entries for a single student."""
+    return by_student.get(student_id, [])
 
 
 def run_ai_for_student(
@@ -222,8 +620,13 @@ def run_ai_for_student(
     status_container: st.delta_generator.DeltaGenerator | None = None,
     event_callback: Callable[[str], None] | None = None,
     chat_refresh: Callable[[], None] | None = None,
-) -> list[str]:
-    """Run the dockerized tutor for a single student and capture logs."""
+    log_archive: Path | None = None,
+) -> deque[bytes]:
+    """Run the dockerized tutor for a single student.
+
+    Every output line is appended to ``log_archive`` (gzip) when given;
+    only the last RUN_LOG_LIMIT lines are kept in memory and returned.
+    """
     run_mode = os.getenv("TUTOR_RUN_MODE", "").strip().lower()
     if not run_mode:
         run_mode = "local" if Path("/.dockerenv").exists() else "docker"
@@ -261,46 +664,79 @@ def run_ai_for_student(
             "docker-run",
             f"ARGS={args}",
         ]
-    env = os.environ.copy()
-    env["SET_TYPE"] = set_type
-    log_lines: list[str] = []
+    env = os.environ | {"SET_TYPE": set_type, "PYTHONUNBUFFERED": "1"}
+    log_tail: deque[bytes] = deque(maxlen=RUN_LOG_LIMIT)
+    last_status_update = 0.0
 
     process = subprocess.Popen(
         cmd,
         cwd=ROOT_DIR,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
+        bufsize=0,
+        pipesize=PIPE_BUFFER_SIZE,
         env=env,
     )
 
-    if process.stdout:
-        for line in process.stdout:
-            clean = line.rstrip()
-            log_lines.append(clean)
-            event = extract_run_event(clean)
-            if event:
-                if event_callback:
-                    event_callback(event)
-                if status_container:
-                    status_container.info(f"⏳ Running tutor... {event}")
-            if chat_refresh and should_refresh_chat(clean):
+    archive = gzip.open(log_archive, "ab") if log_archive else None
+    started = time.monotonic()
+    last_event = ""
+    # Chat refreshes are coalesced: a burst of chat lines repaints at most once
+    # per CHAT_REFRESH_INTERVAL, and a deferred repaint runs on the next idle tick.
+    chat_pending = False
+    last_chat_refresh = 0.0
+    try:
+        for batch in iter_pumped_batches(process.stdout):
+            now = time.monotonic()
+            if batch is None:
+                # Keep the status fresh while the tutor is quiet; this also
+                # gives Streamlit a chance to interrupt the script.
+                if status_container and now - last_status_update >= RUN_HEARTBEAT_INTERVAL:
+                    elapsed = int(now - started)
+                    status_container.info(f"⏳ Running tutor ({elapsed}s)... {last_event}")
+                    last_status_update = now
+            else:
+                log_tail.extend(batch)
+                if archive:
+                    archive.write(b"\n".join(batch) + b"\n")
+                batch_event = ""
+                for raw in batch:
+                    event, is_chat = classify_line(raw)
+                    if event:
+                        batch_event = event
+                        if event_callback:
+                            event_callback(event)
+                    if is_chat and chat_refresh:
+                        chat_pending = True
+                if batch_event:
+                    last_event = batch_event
+                    if status_container and now - last_status_update >= STATUS_UPDATE_INTERVAL:
+                        status_container.info(f"⏳ Running tutor... {batch_event}")
+                        last_status_update = now
+            if chat_pending and now - last_chat_refresh >= CHAT_REFRESH_INTERVAL:
                 chat_refresh()
+                chat_pending = False
+                last_chat_refresh = now
+        process.wait()
+    finally:
+        # A Streamlit rerun interrupts this loop; don't leave the tutor
+        # running with nobody draining its output.
+        stop_process(process)
+        if archive:
+            archive.close()
 
-    process.wait()
     if process.returncode != 0:
         raise RuntimeError(f"Run failed with exit code {process.returncode}")
 
-    return log_lines
+    return log_tail
 
 
 def run_submit_for_set(
     set_type: str,
     parallel: int,
     status_container: st.delta_generator.DeltaGenerator | None = None,
-) -> list[str]:
-    """Submit predictions for a set_type via Docker and capture logs."""
+) -> deque[bytes]:
+    """Submit predictions for a set_type via Docker and return the log tail."""
     run_mode = os.getenv("TUTOR_RUN_MODE", "").strip().lower()
     if not run_mode:
         run_mode = "local" if Path("/.dockerenv").exists() else "docker"
@@ -326,32 +762,47 @@ def run_submit_for_set(
                 f"--parallel {parallel}"
             ),
         ]
-    env = os.environ.copy()
-    env["SET_TYPE"] = set_type
-    log_lines: list[str] = []
+    env = os.environ | {"SET_TYPE": set_type, "PYTHONUNBUFFERED": "1"}
+    log_tail: deque[bytes] = deque(maxlen=RUN_LOG_LIMIT)
+    last_status_update = 0.0
 
     process = subprocess.Popen(
         cmd,
         cwd=ROOT_DIR,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
+        bufsize=0,
+        pipesize=PIPE_BUFFER_SIZE,
         env=env,
     )
 
-    if process.stdout:
-        for line in process.stdout:
-            clean = line.rstrip()
-            log_lines.append(clean)
-            if status_container and clean:
-                status_container.info(f"⏳ Submitting... {clean[:120]}")
-
-    process.wait()
+    started = time.monotonic()
+    try:
+        for batch in iter_pumped_batches(process.stdout):
+            now = time.monotonic()
+            if batch is None:
+                if status_container and now - last_status_update >= RUN_HEARTBEAT_INTERVAL:
+                    status_container.info(f"⏳ Submitting ({int(now - started)}s)...")
+                    last_status_update = now
+                continue
+            log_tail.extend(batch)
+            latest = next((raw for raw in reversed(batch) if raw), b"")
+            if (
+                status_container
+                and latest
+                and now - last_status_update >= STATUS_UPDATE_INTERVAL
+            ):
+                status_container.info(
+                    f"⏳ Submitting... {latest[:120].decode('utf-8', 'replace')}"
+                )
+                last_status_update = now
+        process.wait()
+    finally:
+        stop_process(process)
     if process.returncode != 0:
         raise RuntimeError(f"Submit failed with exit code {process.returncode}")
 
-    return log_lines
+    return log_tail
 
 
 st.set_page_config(page_title="AI Tutor Dev Console", layout="wide")
@@ -411,18 +862,11 @@ with st.sidebar:
         st.error(str(exc))
 
     if students:
-        student_options = [student["id"] for student in students]
-        student_labels = {
-            student["id"]: (
-                f"{student.get('name', student['id'])} "
-                f"(Grade {student.get('grade_level', '?')})"
-            )
-            for student in students
-        }
+        student_labels = build_student_labels(students)
         selected_student_id = st.selectbox(
             "Student",
-            student_options,
-            format_func=lambda student_id: student_labels.get(student_id, student_id),
+            list(student_labels),
+            format_func=student_labels.__getitem__,
         )
 
         # Topic selection
@@ -430,12 +874,11 @@ with st.sidebar:
             topics = fetch_topics_for_student(selected_student_id)
             if topics:
                 st.subheader("Topics")
-                topic_options = [topic["id"] for topic in topics]
-                topic_labels = {topic["id"]: topic.get("name", topic["id"]) for topic in topics}
+                topics_by_id = index_by_id(topics)
                 selected_topic_id = st.selectbox(
                     "Select topic to run",
-                    ["All topics"] + topic_options,
-                    format_func=lambda tid: topic_labels.get(tid, tid) if tid != "All topics" else tid,
+                    ["All topics", *topics_by_id],
+                    format_func=lambda tid: topics_by_id[tid].get("name", tid) if tid in topics_by_id else tid,
                 )
                 if selected_topic_id == "All topics":
                     selected_topic_id = None
@@ -487,16 +930,63 @@ with left:
 
 def load_entries_for_selected_student() -> list[dict[str, Any]]:
     """Load stored chat entries for the selected student."""
-    state_data = load_state(
-        set_type=dev_set_type,
-        include_legacy=include_legacy_state,
-    )
-    if selected_student_id:
-        return get_student_entries(state_data, selected_student_id)
-    return []
+    if not selected_student_id:
+        return []
+    fingerprint = state_fingerprint(dev_set_type, include_legacy_state)
+    # Skip the fingerprint-keyed cache lookup while the files are unchanged.
+    key = (dev_set_type, include_legacy_state, selected_student_id, fingerprint)
+    memo_key, entries = st.session_state["entries_memo"]
+    if memo_key == key:
+        return entries
+    _, by_student = read_state_files(dev_set_type, include_legacy_state, fingerprint)
+    entries = get_student_entries(by_student, selected_student_id)
+    st.session_state["entries_memo"] = (key, entries)
+    return entries
+
+
+def entry_topic_labels(entries: list[dict[str, Any]]) -> list[str]:
+    """Return the display label for each state entry's topic."""
+    return [entry.get("topic_name") or "Topic" for entry in entries]
+
+
+def chat_display_role(message: dict[str, Any]) -> str:
+    """Map a stored message role to a Streamlit chat role."""
+    return "user" if message.get("role") == "student" else "assistant"
+
+
+def topic_run_events(entry: dict[str, Any]) -> list[str]:
+    """Return the run events for an entry's topic, or all events if none are tagged."""
+    run_events = st.session_state.get("run_events", {}).get(selected_student_id, [])
+    topic_events = st.session_state.get("run_events_by_topic", {}).get(selected_student_id, {})
+    return topic_events.get(entry.get("topic_name")) or run_events
+
+
+def render_run_events(entry: dict[str, Any]) -> None:
+    """Show the latest run events relevant to an entry's topic."""
+    display_events = topic_run_events(entry)
+    if display_events:
+        with st.chat_message("assistant"):
+            st.markdown(
+                "**Run events**\n"
+                + "\n".join(f"- {event}" for event in display_events[-8:])
+            )
 
 
-def render_chat_view(entries: list[dict[str, Any]]) -> None:
+def render_chat_messages(history: list[dict[str, Any]]) -> None:
+    """Render chat messages, grouping consecutive turns by display role."""
+    for display_role, messages in itertools.groupby(history, key=chat_display_role):
+        with st.chat_message(display_role):
+            st.markdown(
+                "\n\n---\n\n".join(message.get("content", "") for message in messages)
+            )
+
+
+def render_chat_view(
+    entries: list[dict[str, Any]],
+    topic_labels: list[str] | None = None,
+) -> list[tuple[Any, Any]]:
+    """Render chat tabs and return each tab's (events slot, messages container)."""
+    slots: list[tuple[Any, Any]] = []
     with main_container.container():
         st.subheader("Chat history")
         if not selected_student_id:
@@ -504,41 +994,112 @@ def render_chat_view(entries: list[dict[str, Any]]) -> None:
         elif not entries:
             st.info("No chat history yet. Run the tutor to generate one.")
         else:
-            topic_labels = [entry.get("topic_name", "Topic") for entry in entries]
+            if topic_labels is None:
+                topic_labels = entry_topic_labels(entries)
             tabs = st.tabs(topic_labels)
             for tab, entry in zip(tabs, entries):
                 with tab:
-                    run_events = st.session_state.get("run_events", {}).get(
-                        selected_student_id, []
-                    )
-                    filtered_events = [
-                        event
-                        for event in run_events
-                        if entry.get("topic_name") and entry.get("topic_name") in event
-                    ]
-                    display_events = filtered_events or run_events
-                    if display_events:
-                        with st.chat_message("assistant"):
-                            st.markdown(
-                                "**Run events**\n"
-                                + "\n".join(f"- {event}" for event in display_events[-8:])
-                            )
-                    history = entry.get("history", [])
-                    for message in history:
-                        role = message.get("role", "assistant")
-                        display_role = "assistant"
-                        if role == "student":
-                            display_role = "user"
-                        elif role == "tutor":
-                            display_role = "assistant"
-                        with st.chat_message(display_role):
-                            st.markdown(message.get("content", ""))
-    return None
+                    events_slot = st.empty()
+                    with events_slot.container():
+                        render_run_events(entry)
+                    messages_container = st.container()
+                    with messages_container:
+                        render_chat_messages(entry.get("history", []))
+                slots.append((events_slot, messages_container))
+    return slots
+
+
+def update_chat_view(entries: list[dict[str, Any]], live: dict[str, Any]) -> None:
+    """Append new chat messages into the live tabs, rebuilding only when needed."""
+    topic_labels = entry_topic_labels(entries)
+    lengths = [len(entry.get("history", [])) for entry in entries]
+    # Event lists only grow in place, so (identity, length) tells whether the
+    # list a tab shows has changed since it was painted.
+    event_keys = [
+        (id(events), len(events)) for events in map(topic_run_events, entries)
+    ]
+    if topic_labels != live.get("labels") or any(
+        length < rendered for length, rendered in zip(lengths, live["lengths"])
+    ):
+        live["slots"] = render_chat_view(entries, topic_labels)
+        live["labels"] = topic_labels
+        live["lengths"] = lengths
+        live["events"] = event_keys
+        return
+    for index, (entry, (events_slot, messages_container)) in enumerate(
+        zip(entries, live["slots"])
+    ):
+        if event_keys[index] != live["events"][index]:
+            with events_slot.container():
+                render_run_events(entry)
+            live["events"][index] = event_keys[index]
+        rendered = live["lengths"][index]
+        if lengths[index] > rendered:
+            with messages_container:
+                render_chat_messages(entry.get("history", [])[rendered:])
+            live["lengths"][index] = lengths[index]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def digest_pitch_trace(
+    student_id: str,
+    trace_version: tuple[int, int, int],
+    topic: str,
+    _trace: list[dict[str, str]],
+) -> tuple[list[str], list[dict[str, float]], dict[str, str] | None]:
+    """Derive a topic's timeline, diagnosis metrics and switch event from a trace."""
+    topic_trace = [event for event in _trace if event.get("topic") == topic]
+    return (
+        condense_trace_timeline(topic_trace),
+        extract_diagnosis_metrics(topic_trace),
+        find_switch_event(topic_trace),
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_pitch_chart_specs(
+    metrics: tuple[tuple[float, float, float], ...],
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Build the confidence and level Vega-Lite specs from (turn, level, confidence) rows."""
+    # Altair and pandas are only needed for pitch charts; importing them lazily
+    # keeps them off the cold-start path of the default chat view.
+    import altair as alt
+    import pandas as pd
+
+    metrics_frame = pd.DataFrame.from_records(
+        metrics, columns=["turn", "level", "confidence"]
+    )
+    metrics_frame["confidence"] = (metrics_frame["confidence"] * 100).round(1)
+    turn_axis = alt.X("turn:Q", title="Diagnosis turn", axis=alt.Axis(tickMinStep=1))
+    confidence_chart = (
+        alt.Chart(metrics_frame)
+        .mark_line(point=True)
+        .encode(
+            x=turn_axis,
+            y=alt.Y(
+                "confidence:Q",
+                title="Confidence (%)",
+                scale=alt.Scale(domain=[0, 100]),
+            ),
+        )
+        .properties(height=180)
+    )
+    level_chart = (
+        alt.Chart(metrics_frame)
+        .mark_line(point=True)
+        .encode(
+            x=turn_axis,
+            y=alt.Y("level:Q", title="Level", scale=alt.Scale(domain=[1, 5])),
+        )
+        .properties(height=180)
+    )
+    return confidence_chart.to_dict(), level_chart.to_dict()
 
 
 def render_pitch_view(
     entries: list[dict[str, Any]],
     trace: list[dict[str, str]],
+    topic_labels: list[str] | None = None,
 ) -> None:
     with main_container.container():
         st.subheader("Pitch mode")
@@ -549,16 +1110,21 @@ def render_pitch_view(
         if not entries:
             st.info("Run the tutor to generate a pitch view.")
             return
-        topic_choices = [entry.get("topic_name", "Topic") for entry in entries]
-        topic_choice = st.selectbox("Spotlight topic", topic_choices)
+        if topic_labels is None:
+            topic_labels = entry_topic_labels(entries)
+        topic_choice = st.selectbox("Spotlight topic", topic_labels)
         entry = next(
             (item for item in entries if item.get("topic_name") == topic_choice), None
         )
         if not entry:
             st.info("No data available for that topic yet.")
             return
-        topic_trace = [event for event in trace if event.get("topic") == topic_choice]
-        timeline = condense_trace_timeline(topic_trace)
+        timeline, trace_metrics, switch_event = digest_pitch_trace(
+            selected_student_id,
+            st.session_state["agent_trace_version"],
+            topic_choice,
+            trace,
+        )
         diagnostic_events = entry.get("diagnostic_events", [])
         metrics = []
         if diagnostic_events:
@@ -571,10 +1137,9 @@ def render_pitch_view(
                     }
                 )
         else:
-            metrics = extract_diagnosis_metrics(topic_trace)
+            metrics = trace_metrics
         switch_reason = entry.get("switch_reason")
         level_locked = entry.get("level_locked")
-        switch_event = find_switch_event(topic_trace)
 
         st.markdown("**Decision timeline**")
         if timeline:
@@ -583,49 +1148,13 @@ def render_pitch_view(
             st.caption("No agent timeline available yet.")
 
         if metrics:
-            confidence_series = [
-                {"turn": item["turn"], "value": round(item["confidence"] * 100, 1)}
-                for item in metrics
-            ]
-            level_series = [
-                {"turn": item["turn"], "value": item["level"]} for item in metrics
-            ]
-            confidence_chart = (
-                alt.Chart(alt.Data(values=confidence_series))
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "turn:Q",
-                        title="Diagnosis turn",
-                        axis=alt.Axis(tickMinStep=1),
-                    ),
-                    y=alt.Y(
-                        "value:Q",
-                        title="Confidence (%)",
-                        scale=alt.Scale(domain=[0, 100]),
-                    ),
-                )
-                .properties(height=180)
-            )
-            level_chart = (
-                alt.Chart(alt.Data(values=level_series))
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "turn:Q",
-                        title="Diagnosis turn",
-                        axis=alt.Axis(tickMinStep=1),
-                    ),
-                    y=alt.Y(
-                        "value:Q",
-                        title="Level",
-                        scale=alt.Scale(domain=[1, 5]),
-                    ),
+            confidence_spec, level_spec = build_pitch_chart_specs(
+                tuple(
+                    (item["turn"], item["level"], item["confidence"]) for item in metrics
                 )
-                .properties(height=180)
             )
-            st.altair_chart(confidence_chart, use_container_width=True)
-            st.altair_chart(level_chart, use_container_width=True)
+            st.vega_lite_chart(spec=confidence_spec, use_container_width=True)
+            st.vega_lite_chart(spec=level_spec, use_container_width=True)
         else:
             st.caption("No diagnosis metrics available yet.")
 
@@ -666,14 +1195,7 @@ def render_pitch_view(
             )
 
         history = entry.get("history", [])
-        opener = next(
-            (message.get("content", "") for message in history if message.get("role") == "tutor"),
-            "",
-        )
-        last_tutor = next(
-            (message.get("content", "") for message in reversed(history) if message.get("role") == "tutor"),
-            "",
-        )
+        opener, last_tutor = first_and_last_tutor_messages(history)
         snippet_cols = st.columns(2)
         with snippet_cols[0]:
             st.markdown("**Trap question**")
@@ -683,26 +1205,53 @@ def render_pitch_view(
             st.write(last_tutor or "Not available yet.")
 
 
+@st.fragment
+def render_agent_activity(
+    student_id: str | None,
+    trace: list[dict[str, str]],
+    topic_labels: list[str],
+) -> None:
+    """Render the agent activity panel; filter changes rerun only this fragment."""
+    st.subheader("Agent activity")
+    topic_filter = "All"
+    topic_choices = ["All", *topic_labels]
+    if len(topic_choices) > 1:
+        topic_filter = st.selectbox("Topic filter", topic_choices)
+
+    if trace:
+        last_by_agent, trace_frame = digest_agent_activity(
+            student_id, st.session_state["agent_trace_version"], topic_filter, trace
+        )
+        for agent_name in AGENT_NAMES:
+            if agent_name in last_by_agent:
+                event = last_by_agent[agent_name]
+                st.markdown(f"**{agent_name}**")
+                st.caption(event.get("detail", ""))
+        with st.expander("Full agent trace"):
+            st.dataframe(trace_frame, use_container_width=True)
+    else:
+        st.info("Run the tutor to see agent activity.")
+
+
 if run_clicked and selected_student_id:
     st.session_state["run_state"][selected_student_id] = "running"
     st.session_state["run_events"][selected_student_id] = []
+    st.session_state["run_events_by_topic"][selected_student_id] = {}
     run_status_slot.info("⏳ Tutor run in progress...")
 
+    live_chat: dict[str, Any] = {"labels": None, "lengths": [], "slots": [], "events": []}
+
     def refresh_view() -> None:
         entries = load_entries_for_selected_student()
-        current_trace = (
-            st.session_state.get("agent_traces", {}).get(selected_student_id, [])
-            if selected_student_id
-            else []
-        )
         if pitch_mode:
+            current_trace = st.session_state.get("agent_traces", {}).get(selected_student_id, [])
             render_pitch_view(entries, current_trace)
         else:
-            render_chat_view(entries)
+            update_chat_view(entries, live_chat)
 
     try:
         with st.spinner("Running tutor in Docker..."):
-            log_lines = run_ai_for_student(
+            run_log = run_ai_for_student(
                 selected_student_id,
                 dev_set_type,
                 run_turns,
@@ -710,26 +1259,27 @@ if run_clicked and selected_student_id:
                 run_parallel,
                 selected_topic_id,
                 run_status_slot,
-                st.session_state["run_events"][selected_student_id].append,
+                functools.partial(record_run_event, selected_student_id),
                 refresh_view,
+                run_log_path(selected_student_id),
             )
-        st.session_state["run_logs"][selected_student_id] = log_lines
-        hydrate_agent_traces()
+        st.session_state["run_logs"][selected_student_id] = run_log
+        st.session_state["run_log_tail"][selected_student_id] = b"\n".join(
+            itertools.islice(run_log, max(0, len(run_log) - RUN_LOG_TAIL_LINES), None)
+        ).decode("utf-8", "replace")
         st.session_state["last_status"][selected_student_id] = "completed"
         st.session_state["run_state"][selected_student_id] = "completed"
         run_status_slot.success("✅ Tutor run completed.")
-        entries = load_entries_for_selected_student()
-        current = st.session_state.get("agent_traces", {})
-        trace = current.get(selected_student_id, [])
-        if pitch_mode:
-            render_pitch_view(entries, trace)
-        else:
-            render_chat_view(entries)
+        # The rerun re-hydrates traces and renders the final view once.
         st.rerun()
     except Exception as exc:
         st.session_state["last_status"][selected_student_id] = f"error: {exc}"
         st.session_state["run_state"][selected_student_id] = f"error: {exc}"
         run_status_slot.error(f"Run failed: {exc}")
+    finally:
+        # Reruns triggered mid-run stop the script without an Exception.
+        if st.session_state["run_state"].get(selected_student_id) == "running":
+            st.session_state["run_state"][selected_student_id] = "error: run interrupted"
 
 if submit_clicked:
     submit_status = st.empty()
@@ -743,15 +1293,16 @@ if submit_clicked:
         submit_status.error(f"Submission failed: {exc}")
 
 student_entries = load_entries_for_selected_student()
+student_topic_labels = entry_topic_labels(student_entries)
 current_trace = (
     st.session_state.get("agent_traces", {}).get(selected_student_id, [])
     if selected_student_id
     else []
 )
 if pitch_mode:
-    render_pitch_view(student_entries, current_trace)
+    render_pitch_view(student_entries, current_trace, student_topic_labels)
 else:
-    render_chat_view(student_entries)
+    render_chat_view(student_entries, student_topic_labels)
 
 st.divider()
 st.subheader("Submission history")
@@ -771,34 +1322,11 @@ if summary["rows"]:
 else:
     st.info("No submission history yet. Run a submit to populate this table.")
 
+
 with right:
-    st.subheader("Agent activity")
-    trace = current_trace
-    topic_filter = "All"
-    topic_choices = ["All"]
-    if student_entries:
-        topic_choices += [entry.get("topic_name", "Topic") for entry in student_entries]
-    if len(topic_choices) > 1:
-        topic_filter = st.selectbox("Topic filter", topic_choices)
+    render_agent_activity(selected_student_id, current_trace, student_topic_labels)
 
-    if trace:
-        if topic_filter != "All":
-            trace = [event for event in trace if event.get("topic") == topic_filter]
-        last_by_agent: dict[str, dict[str, str]] = {}
-        for event in trace:
-            last_by_agent[event["agent"]] = event
-        for agent_name in [
-            "Opener",
-            "Detective",
-            "Tutor",
-            "Shot Clock",
-            "Confidence Gate",
-        ]:
-            if agent_name in last_by_agent:
-                event = last_by_agent[agent_name]
-                st.markdown(f"**{agent_name}**")
-                st.caption(event.get("detail", ""))
-        with st.expander("Full agent trace"):
-            st.dataframe(trace, use_container_width=True)
-    else:
-        st.info("Run the tutor to see agent activity.")
+    run_log_tail = st.session_state["run_log_tail"].get(selected_student_id)
+    if run_log_tail:
+        with st.expander("Run log"):
+            st.code(run_log_tail, language="text")
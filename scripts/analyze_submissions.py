@@ -2,8 +2,11 @@
 """Analyze submission history to track MSE trends and suggest improvements."""
 
 import json
+import sys
 from pathlib import Path
 
+import orjson
+
 
 def analyze_submissions():
     history_path = Path("data/submission_history.json")
@@ -12,21 +15,27 @@ def analyze_submissions():
         print("No submission history found. Run with --submit first.")
         return
     
-    history = json.loads(history_path.read_text())
+    history = orjson.loads(history_path.read_bytes())
     submissions = history.get("submissions", [])
     
     if not submissions:
         print("No submissions recorded yet.")
         return
     
-    print(f"\n{'='*60}")
-    print(f"SUBMISSION HISTORY ANALYSIS ({len(submissions)} submissions)")
-    print(f"{'='*60}\n")
+    # Build the report and write it once instead of one print() per row
+    out = []
+    out.append(f"\n{'='*60}")
+    out.append(f"SUBMISSION HISTORY ANALYSIS ({len(submissions)} submissions)")
+    out.append(f"{'='*60}\n")
     
     # Table header
-    print(f"{'#':<4} {'Timestamp':<20} {'Set':<10} {'MSE':<8} {'Preds':<6}")
-    print("-" * 60)
+    out.append(f"{'#':<4} {'Timestamp':<20} {'Set':<10} {'MSE':<8} {'Preds':<6}")
+    out.append("-" * 60)
     
+    # Only colour for a terminal; piped output gets plain text
+    use_color = sys.stdout.isatty()
+    # Escape codes add 9 invisible characters to the colored MSE column
+    mse_width = 17 if use_color else 8
     mse_scores = []
     for i, sub in enumerate(submissions, 1):
         ts = sub["timestamp"][:16].replace("T", " ")
@@ -37,36 +46,42 @@ def analyze_submissions():
         mse_scores.append(mse)
         
         # Color code MSE (terminal colors)
-        if mse <= 0.5:
+        if not use_color:
+            mse_str = f"{mse:.4f}"
+        elif mse <= 0.5:
             mse_str = f"\033[92m{mse:.4f}\033[0m"  # Green
         elif mse <= 1.0:
             mse_str = f"\033[93m{mse:.4f}\033[0m"  # Yellow
         else:
             mse_str = f"\033[91m{mse:.4f}\033[0m"  # Red
         
-        print(f"{i:<4} {ts:<20} {set_type:<10} {mse_str:<17} {num:<6}")
+        out.append(f"{i:<4} {ts:<20} {set_type:<10} {mse_str:<{mse_width}} {num:<6}")
     
-    print("-" * 60)
+    out.append("-" * 60)
     
+    # One argmin over the collected scores serves both the stats and the best row
+    best_index = min(range(len(mse_scores)), key=mse_scores.__getitem__)
+
     # Stats
     if len(mse_scores) >= 2:
-        best = min(mse_scores)
+        best = mse_scores[best_index]
         worst = max(mse_scores)
         avg = sum(mse_scores) / len(mse_scores)
         trend = mse_scores[-1] - mse_scores[0]
         
-        print(f"\nStatistics:")
-        print(f"  Best MSE:  {best:.4f}")
-        print(f"  Worst MSE: {worst:.4f}")
-        print(f"  Average:   {avg:.4f}")
-        print(f"  Trend:     {'↓' if trend < 0 else '↑'} {abs(trend):.4f} (first → last)")
+        out.append(f"\nStatistics:")
+        out.append(f"  Best MSE:  {best:.4f}")
+        out.append(f"  Worst MSE: {worst:.4f}")
+        out.append(f"  Average:   {avg:.4f}")
+        out.append(f"  Trend:     {'↓' if trend < 0 else '↑'} {abs(trend):.4f} (first → last)")
     
     # Best submission details
-    best_sub = min(submissions, key=lambda x: x["mse_score"])
-    print(f"\n🏆 Best Submission (MSE={best_sub['mse_score']:.4f}):")
-    print(f"   Config: {json.dumps(best_sub.get('config', {}), indent=2)}")
+    best_sub = submissions[best_index]
+    out.append(f"\n🏆 Best Submission (MSE={best_sub['mse_score']:.4f}):")
+    out.append(f"   Config: {json.dumps(best_sub.get('config', {}), indent=2)}")
     
-    print(f"\n{'='*60}\n")
+    out.append(f"\n{'='*60}\n")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
 """Configuration from .env file."""
 
-from pydantic_settings import BaseSettings
+import os
+from dataclasses import MISSING, dataclass, fields
+from functools import lru_cache
 
+from dotenv import dotenv_values
 
-class Settings(BaseSettings):
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     OPENAI_API_KEY: str
     KNOWUNITY_X_API_KEY: str
     KNOWUNITY_BASE_URL: str = "https://knowunity-agent-olympics-2026-api.vercel.app"
@@ -13,9 +18,23 @@ class Settings(BaseSettings):
     MAX_CONVERSATIONS: int = 0  # 0 = unlimited (run all), else limit total sessions
     LOG_LEVEL: str = "INFO"
 
-    class Config:
-        env_file = ".env"
-
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """Read settings from the environment, falling back to the .env file."""
+        # Real environment variables win over .env, and os.environ is not modified
+        source = {**dotenv_values(env_file), **os.environ}
+        values = {}
+        for field in fields(cls):
+            raw = source.get(field.name)
+            if raw is None:
+                if field.default is MISSING:
+                    raise ValueError(f"Missing required setting {field.name}")
+                continue
+            values[field.name] = field.type(raw)
+        return cls(**values)
 
-settings = Settings()
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading .env and the environment once."""
+    return Settings.from_env()
@@ -7,24 +7,212 @@ Usage:
     python -m src.main --max-convos 5          # Limit to 5 total conversations
     python -m src.main --set-type dev          # Override set type
     python -m src.main --student-id UUID       # Run single student
+    python -m src.main --parallel 8 --qpm 60   # Parallel, capped at 60 LLM calls/min
+    python -m src.main --resume                # Continue an interrupted run
 """
 
 import argparse
-import json
+import concurrent.futures
 import logging
 from pathlib import Path
+from typing import Callable
 
-from src.config import settings
+import httpx
+import orjson
+
+from src.config import get_settings
 from src.models import StudentState, Message, DiagnosticEvent
 from src.services.llm import LLMService
 from src.services.knowunity import KnowunityClient
 from src.services.database import DatabaseService
+from src.services.rate_limiter import RateLimiter
 from src.services.trace_store import TraceStore
 
-logging.basicConfig(level=settings.LOG_LEVEL, format="%(levelname)s: %(message)s")
 log = logging.getLogger(__name__)
 
 
+def send_and_record(
+    api: KnowunityClient,
+    db: DatabaseService,
+    state: StudentState,
+    conv_id: str,
+    tutor_msg: str,
+) -> dict:
+    """Send one tutor message, record the exchange, and persist the state."""
+    response = api.interact(conv_id, tutor_msg)
+    # Tutor text is always an LLM string, so skip re-validating it;
+    # the student's text comes from the API and is still validated
+    state.history += (
+        Message.model_construct(role="tutor", content=tutor_msg),
+        Message(role="student", content=response["student_response"]),
+    )
+    state.turn_count += 1
+    state.conversation_complete = bool(response.get("is_complete"))
+    db.save_state(state)
+    return response
+
+
+def diagnose_turn(
+    llm: LLMService,
+    state: StudentState,
+    trace_events: list[dict[str, str]],
+    student_name: str,
+    student_msg: str,
+) -> str:
+    """Run one DIAGNOSIS turn and return the next tutor message.
+
+    Sets state.level_locked once confident, which ends the diagnosis phase.
+    """
+    topic_name = state.topic_name
+    analysis = llm.analyze_with_verification(state, student_msg)
+
+    # ========== EVIDENCE-BASED LEVEL CALCULATION ==========
+    # Use LLM as feature extractor, not judge
+    old_level = state.estimated_level
+    llm_level = analysis.estimated_level
+
+    # Calculate evidence signal
+    signal = (
+        1.0 * (1 if analysis.is_correct else 0)
+        + 0.5 * (1 if analysis.reasoning_score >= 4 else 0)
+        - 0.8 * (1 if analysis.misconception else 0)
+    )
+
+    # FIRST 2 TURNS: Collect evidence, set baseline from average
+    if state.turn_count == 1:
+        state.estimated_level = llm_level
+        log.info(
+            "    [%s] → Initial estimate Level %d (turn 1)", student_name, llm_level
+        )
+    elif state.turn_count == 2:
+        # Average of first 2 estimates (variance reduction)
+        avg_level = round((old_level + llm_level) / 2)
+        state.estimated_level = max(1, min(5, avg_level))
+        log.info(
+            "    [%s] → Baseline set to Level %d (avg of turns 1-2)",
+            student_name, state.estimated_level,
+        )
+    # SUBSEQUENT TURNS: Apply asymmetric rules
+    elif llm_level > old_level:
+        # Promotion: require 2 consecutive votes
+        state.promo_votes += 1
+        if state.promo_votes >= 2:
+            state.estimated_level = min(old_level + 1, 5)
+            state.promo_votes = 0
+            log.info(
+                "    [%s] → Promoted to Level %d (2 votes)",
+                student_name, state.estimated_level,
+            )
+    elif llm_level < old_level:
+        # Demotion: require strong evidence (wrong + low reasoning)
+        if not analysis.is_correct and analysis.reasoning_score <= 2:
+            state.estimated_level = max(old_level - 1, 1)
+            state.promo_votes = 0
+            log.info(
+                "    [%s] → Demoted to Level %d (strong evidence)",
+                student_name, state.estimated_level,
+            )
+    else:
+        # Same level: reset promo votes if consistent
+        state.promo_votes = 0
+
+    # ========== CONFIDENCE SMOOTHING (timing only) ==========
+    raw_conf = analysis.confidence
+    smoothed_conf = min(state.confidence + 0.15, raw_conf)  # slower increase
+    smoothed_conf = round(min(0.95, smoothed_conf), 2)
+    state.confidence = smoothed_conf
+
+    if analysis.misconception:
+        state.misconceptions.append(analysis.misconception)
+
+    tutor_msg = analysis.next_message
+    log.info(
+        "[%s] [DIAGNOSIS Turn %d] Level=%d Conf=%.2f (LLM=%d, signal=%.1f)",
+        student_name, state.turn_count, state.estimated_level,
+        smoothed_conf, llm_level, signal,
+    )
+    trace_events.append(
+        {
+            "agent": "Detective",
+            "detail": (
+                f"Level={state.estimated_level} Conf={smoothed_conf:.2f} "
+                f"(LLM={llm_level}, signal={signal:.1f})"
+            ),
+            "topic": topic_name,
+        }
+    )
+
+    # ========== LOG DIAGNOSTIC EVENT ==========
+    event = DiagnosticEvent(
+        turn=state.turn_count,
+        is_correct=analysis.is_correct,
+        reasoning_score=analysis.reasoning_score,
+        misconception=analysis.misconception,
+        llm_level=llm_level,
+        computed_level=state.estimated_level,
+        confidence=smoothed_conf,
+    )
+    state.diagnostic_events.append(event)
+
+    # ========== EARLY EXIT: Skip remaining diagnosis if extremely confident ==========
+    # Require 3+ events so finalizer has enough data for stable median
+    if (
+        analysis.confidence >= 0.85
+        and analysis.is_correct
+        and analysis.reasoning_score >= 4
+        and len(state.diagnostic_events) >= 3
+    ):
+        state.level_locked = True
+        state.switch_reason = "early_exit"
+        log.info(
+            "[%s] >>> EARLY EXIT: High confidence (%.2f) + correct + good reasoning",
+            student_name, analysis.confidence,
+        )
+    # Level freezing: once confident, lock it
+    elif state.confidence >= 0.75:
+        state.level_locked = True
+        state.switch_reason = "confidence"
+        log.info(
+            "[%s] >>> Level FROZEN at %d (confidence=%.2f)",
+            student_name, state.estimated_level, state.confidence,
+        )
+        trace_events.append(
+            {
+                "agent": "Confidence Gate",
+                "detail": (
+                    f"Level FROZEN at {state.estimated_level} "
+                    f"(confidence={state.confidence:.2f})"
+                ),
+                "topic": topic_name,
+            }
+        )
+
+    return tutor_msg
+
+
+def tutor_turn(
+    llm: LLMService,
+    state: StudentState,
+    trace_events: list[dict[str, str]],
+    student_name: str,
+    student_msg: str,
+) -> str:
+    """Run one TUTORING turn at the diagnosed level and return the next tutor message."""
+    tutor_msg = llm.tutor(state, student_msg)
+    log.info(
+        "[%s] [TUTORING Turn %d] Teaching at Level %d",
+        student_name, state.turn_count, state.estimated_level,
+    )
+    trace_events.append(
+        {
+            "agent": "Tutor",
+            "detail": f"Teaching at Level {state.estimated_level}",
+            "topic": state.topic_name,
+        }
+    )
+    return tutor_msg
+
+
 def run_conversation(
     llm: LLMService,
     api: KnowunityClient,
@@ -34,52 +222,73 @@ def run_conversation(
     student_name: str,
     topic: dict,
     turns: int,
+    generate_opener: Callable[[str], str] | None = None,
+    resume: bool = False,
 ) -> int:
-    """Run a single conversation. Returns predicted level."""
+    """Run a single conversation. Returns predicted level.
+
+    generate_opener overrides llm.generate_opener, e.g. to share openers per topic.
+    With resume, a saved state for this student-topic pair continues its
+    conversation from the last recorded turn instead of starting over.
+    """
 
     topic_id = topic["id"]
     topic_name = topic["name"]
-    log.info(f"[{student_name}] Starting: {topic_name}")
-
-    # Start conversation
-    conv = api.start_conversation(student_id, topic_id)
-    conv_id = conv["conversation_id"]
-
-    # Initialize state
-    state = StudentState(
-        student_id=student_id,
-        topic_id=topic_id,
-        topic_name=topic_name,
-    )
-
-    # Turn 0: Generate opener (trap question)
-    opener = llm.generate_opener(topic_name)
-    log.info(f"[{student_name}] Tutor: {opener[:60]}...")
-    trace_events.append({"agent": "Opener", "detail": opener, "topic": topic_name})
+    log.info("[%s] Starting: %s", student_name, topic_name)
+
+    def start_fresh() -> tuple[StudentState, str, dict, str]:
+        # Start conversation and generate the opener (trap question) concurrently:
+        # neither depends on the other, so the API round-trip hides behind the LLM call
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            conv_future = executor.submit(api.start_conversation, student_id, topic_id)
+            opener = (generate_opener or llm.generate_opener)(topic_name)
+            conv = conv_future.result()
+        conv_id = conv["conversation_id"]
+
+        # Initialize state
+        state = StudentState(
+            student_id=student_id,
+            topic_id=topic_id,
+            topic_name=topic_name,
+            conversation_id=conv_id,
+        )
 
-    response = api.interact(conv_id, opener)
-    student_msg = response["student_response"]
-    log.info(f"[{student_name}] Student: {student_msg[:60]}...")
+        # Turn 0: Send opener
+        log.info("[%s] Tutor: %.60s...", student_name, opener)
+        trace_events.append({"agent": "Opener", "detail": opener, "topic": topic_name})
 
-    state.history.append(Message(role="tutor", content=opener))
-    state.history.append(Message(role="student", content=student_msg))
-    state.turn_count = 1
-    db.save_state(state)
+        response = send_and_record(api, db, state, conv_id, opener)
+        student_msg = response["student_response"]
+        log.info("[%s] Student: %.60s...", student_name, student_msg)
+        return state, conv_id, response, student_msg
+
+    saved = db.get_state(student_id, topic_id) if resume else None
+    # A resumed conversation is only known to be live once Knowunity accepts
+    # the next message; until then a rejection falls back to a fresh start
+    unconfirmed_resume = bool(saved and saved.conversation_id and saved.history)
+    if unconfirmed_resume:
+        # Every turn is saved after the student replies, so the last message
+        # is the one to answer next; finished sessions go straight to the finalizer
+        state = saved
+        conv_id = state.conversation_id
+        response = {"is_complete": state.conversation_complete}
+        student_msg = state.history[-1].content
+        log.info("[%s] Resuming at Turn %d", student_name, state.turn_count)
+    else:
+        state, conv_id, response, student_msg = start_fresh()
 
-    level_frozen = False  # Once confident, lock the level
     SHOT_CLOCK = 6  # Force switch at this turn no matter what
 
     # Main loop: diagnosis + tutoring
     while state.turn_count < turns and not response.get("is_complete"):
 
         # Check shot clock FIRST (fail-safe)
-        if not level_frozen and state.turn_count >= SHOT_CLOCK:
-            level_frozen = True
+        if not state.level_locked and state.turn_count >= SHOT_CLOCK:
             state.level_locked = True
             state.switch_reason = "shot_clock"
             log.warning(
-                f"[{student_name}] >>> SHOT CLOCK: Forcing switch at Turn {SHOT_CLOCK} "
-                f"(Conf={state.confidence:.2f})"
+                "[%s] >>> SHOT CLOCK: Forcing switch at Turn %d (Conf=%.2f)",
+                student_name, SHOT_CLOCK, state.confidence,
             )
             trace_events.append(
                 {
@@ -92,160 +301,35 @@ def run_conversation(
                 }
             )
 
-        if not level_frozen and state.confidence < 0.75:
-            # DIAGNOSIS PHASE (with verification in ambiguity zone)
-            analysis = llm.analyze_with_verification(state, student_msg)
-
-            # ========== EVIDENCE-BASED LEVEL CALCULATION ==========
-            # Use LLM as feature extractor, not judge
-            old_level = state.estimated_level
-            llm_level = analysis.estimated_level
-
-            # Calculate evidence signal
-            signal = (
-                1.0 * (1 if analysis.is_correct else 0)
-                + 0.5 * (1 if analysis.reasoning_score >= 4 else 0)
-                - 0.8 * (1 if analysis.misconception else 0)
-            )
-
-            # FIRST 2 TURNS: Collect evidence, set baseline from average
-            if state.turn_count == 1:
-                state.estimated_level = llm_level
-                log.info(
-                    f"    [{student_name}] → Initial estimate Level {llm_level} "
-                    f"(turn 1)"
-                )
-            elif state.turn_count == 2:
-                # Average of first 2 estimates (variance reduction)
-                avg_level = round((old_level + llm_level) / 2)
-                state.estimated_level = max(1, min(5, avg_level))
-                log.info(
-                    f"    [{student_name}] → Baseline set to Level "
-                    f"{state.estimated_level} (avg of turns 1-2)"
-                )
-            # SUBSEQUENT TURNS: Apply asymmetric rules
-            elif llm_level > old_level:
-                # Promotion: require 2 consecutive votes
-                state.promo_votes += 1
-                if state.promo_votes >= 2:
-                    state.estimated_level = min(old_level + 1, 5)
-                    state.promo_votes = 0
-                    log.info(
-                        f"    [{student_name}] → Promoted to Level "
-                        f"{state.estimated_level} (2 votes)"
-                    )
-            elif llm_level < old_level:
-                # Demotion: require strong evidence (wrong + low reasoning)
-                if not analysis.is_correct and analysis.reasoning_score <= 2:
-                    state.estimated_level = max(old_level - 1, 1)
-                    state.promo_votes = 0
-                    log.info(
-                        f"    [{student_name}] → Demoted to Level "
-                        f"{state.estimated_level} (strong evidence)"
-                    )
-            else:
-                # Same level: reset promo votes if consistent
-                state.promo_votes = 0
-
-            # ========== CONFIDENCE SMOOTHING (timing only) ==========
-            raw_conf = analysis.confidence
-            smoothed_conf = min(state.confidence + 0.15, raw_conf)  # slower increase
-            smoothed_conf = round(min(0.95, smoothed_conf), 2)
-            state.confidence = smoothed_conf
-
-            if analysis.misconception:
-                state.misconceptions.append(analysis.misconception)
-
-            tutor_msg = analysis.next_message
-            log.info(
-                f"[{student_name}] [DIAGNOSIS Turn {state.turn_count}] "
-                f"Level={state.estimated_level} Conf={smoothed_conf:.2f} "
-                f"(LLM={llm_level}, signal={signal:.1f})"
-            )
-            trace_events.append(
-                {
-                    "agent": "Detective",
-                    "detail": (
-                        f"Level={state.estimated_level} Conf={smoothed_conf:.2f} "
-                        f"(LLM={llm_level}, signal={signal:.1f})"
-                    ),
-                    "topic": topic_name,
-                }
-            )
-
-            # ========== LOG DIAGNOSTIC EVENT ==========
-            event = DiagnosticEvent(
-                turn=state.turn_count,
-                is_correct=analysis.is_correct,
-                reasoning_score=analysis.reasoning_score,
-                misconception=analysis.misconception,
-                llm_level=llm_level,
-                computed_level=state.estimated_level,
-                confidence=smoothed_conf,
-            )
-            state.diagnostic_events.append(event)
-
-            # ========== EARLY EXIT: Skip remaining diagnosis if extremely confident ==========
-            # Require 3+ events so finalizer has enough data for stable median
-            if (
-                analysis.confidence >= 0.85
-                and analysis.is_correct
-                and analysis.reasoning_score >= 4
-                and len(state.diagnostic_events) >= 3
-            ):
-                level_frozen = True
-                state.level_locked = True
-                state.switch_reason = "early_exit"
-                log.info(
-                    f"[{student_name}] >>> EARLY EXIT: High confidence "
-                    f"({analysis.confidence:.2f}) + correct + good reasoning"
-                )
-            # Level freezing: once confident, lock it
-            elif state.confidence >= 0.75:
-                level_frozen = True
-                state.level_locked = True
-                state.switch_reason = "confidence"
-                log.info(
-                    f"[{student_name}] >>> Level FROZEN at {state.estimated_level} "
-                    f"(confidence={state.confidence:.2f})"
-                )
-                trace_events.append(
-                    {
-                        "agent": "Confidence Gate",
-                        "detail": (
-                            f"Level FROZEN at {state.estimated_level} "
-                            f"(confidence={state.confidence:.2f})"
-                        ),
-                        "topic": topic_name,
-                    }
-                )
+        # Diagnose until the level is locked (or already confident), then only tutor
+        if state.level_locked or state.confidence >= 0.75:
+            step = tutor_turn
         else:
-            # TUTORING PHASE
-            tutor_msg = llm.tutor(state, student_msg)
-            log.info(
-                f"[{student_name}] [TUTORING Turn {state.turn_count}] Teaching "
-                f"at Level {state.estimated_level}"
-            )
-            trace_events.append(
-                {
-                    "agent": "Tutor",
-                    "detail": f"Teaching at Level {state.estimated_level}",
-                    "topic": topic_name,
-                }
-            )
+            step = diagnose_turn
+        trace_mark = len(trace_events)
+        tutor_msg = step(llm, state, trace_events, student_name, student_msg)
 
         # Send to student
-        response = api.interact(conv_id, tutor_msg)
+        try:
+            response = send_and_record(api, db, state, conv_id, tutor_msg)
+        except httpx.HTTPError as e:
+            if not unconfirmed_resume:
+                raise
+            log.warning(
+                "[%s] Saved conversation %s rejected (%s); starting over",
+                student_name, conv_id, e,
+            )
+            del trace_events[trace_mark:]
+            unconfirmed_resume = False
+            state, conv_id, response, student_msg = start_fresh()
+            continue
+        unconfirmed_resume = False
         student_msg = response["student_response"]
-        log.info(f"[{student_name}] [Student Response]: {student_msg[:60]}...")
-
-        state.history.append(Message(role="tutor", content=tutor_msg))
-        state.history.append(Message(role="student", content=student_msg))
-        state.turn_count += 1
-        db.save_state(state)
+        log.info("[%s] [Student Response]: %.60s...", student_name, student_msg)
 
     # ========== DETERMINISTIC FINALIZER ==========
     # Use median of last K diagnostic events to stabilize the final level
+    saved_level = state.estimated_level
     if state.diagnostic_events:
         k_events = min(3, len(state.diagnostic_events))  # Last 3 events or fewer
         recent_levels = [e.computed_level for e in state.diagnostic_events[-k_events:]]
@@ -257,17 +341,19 @@ def run_conversation(
             # In ambiguous cases, trust the median more
             state.estimated_level = median_level
             log.info(
-                f"    [FINALIZER] Adjusted to median level {median_level} "
-                f"(from last {k_events} events)"
+                "    [FINALIZER] Adjusted to median level %d (from last %d events)",
+                median_level, k_events,
             )
 
     log.info(
-        f"[{student_name}] === Session Complete: Level={state.estimated_level}, "
-        f"Confidence={state.confidence:.2f} ==="
+        "[%s] === Session Complete: Level=%d, Confidence=%.2f ===",
+        student_name, state.estimated_level, state.confidence,
     )
 
-    # Persist state
-    db.save_state(state)
+    # Persist state (every turn already saved it; only the finalizer can have
+    # changed it since, and the dashboard reads those per-turn saves live)
+    if state.estimated_level != saved_level:
+        db.save_state(state)
 
     return state.estimated_level
 
@@ -285,41 +371,97 @@ def run_batch(
     if args.student_id:
         students = [s for s in students if s["id"] == args.student_id]
 
-    log.info(f"Found {len(students)} students")
+    log.info("Found %d students", len(students))
+
+    parallel = getattr(args, "parallel", 1)
+    topic_id = getattr(args, "topic_id", None)
+    resume = getattr(args, "resume", False)
+
+    def student_tasks(student):
+        topics = api.get_topics(student["id"])
+        # Filter by topic_id if specified
+        if topic_id:
+            topics = [t for t in topics if t["id"] == topic_id]
+        return [(student, topic) for topic in topics]
 
     # Build task list: (student, topic)
     tasks = []
-    for student in students:
-        sid = student["id"]
-        topics = api.get_topics(sid)
-        # Filter by topic_id if specified
-        if args.topic_id:
-            topics = [t for t in topics if t["id"] == args.topic_id]
-        for topic in topics:
-            tasks.append((student, topic))
+    if parallel > 1 and len(students) > 1:
+        # Topic lookups are independent round-trips; fetch them concurrently
+        # (map keeps student order, so max_convos still takes the same tasks)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(parallel, len(students))
+        ) as executor:
+            for student_topic_tasks in executor.map(student_tasks, students):
+                tasks.extend(student_topic_tasks)
+    else:
+        for student in students:
+            tasks.extend(student_tasks(student))
+            # Later students would be cut by max_convos anyway
+            if 0 < args.max_convos <= len(tasks):
+                break
 
     # Apply max_convos limit
     if args.max_convos > 0:
         tasks = tasks[: args.max_convos]
 
-    parallel = getattr(args, "parallel", 1)
     actual_parallel = max(1, min(parallel, len(tasks))) if tasks else 1
-    log.info(f"Processing {len(tasks)} conversations (parallel={actual_parallel})")
+    log.info("Processing %d conversations (parallel=%d)", len(tasks), actual_parallel)
 
     import threading
 
     trace_lock = threading.Lock()
     predictions: list[dict] = []
 
+    # Each finished conversation is journaled to data/predictions.jsonl, so a
+    # crashed run keeps its results; --resume reuses them instead of rerunning
+    Path("data").mkdir(exist_ok=True)
+    predictions_journal_path = Path("data/predictions.jsonl")
+    journaled: dict[tuple[str, str], dict] = {}
+    if resume and predictions_journal_path.exists():
+        data = predictions_journal_path.read_bytes()
+        # Drop a line cut off by the crash so new records start on a fresh line
+        data = data[: data.rfind(b"\n") + 1]
+        predictions_journal_path.write_bytes(data)
+        for line in data.splitlines():
+            try:
+                result = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                result = None
+            if not isinstance(result, dict) or not {
+                "student_id", "topic_id", "predicted_level"
+            } <= result.keys():
+                # A damaged record only costs a rerun of that task
+                log.warning("Skipping unreadable predictions journal line: %.80r", line)
+                continue
+            journaled[(result["student_id"], result["topic_id"])] = result
+    predictions_journal = predictions_journal_path.open("ab" if resume else "wb")
+    journal_lock = threading.Lock()
+
+    # The opener depends only on the topic, so generate it once per topic per
+    # run; the per-topic lock makes parallel workers wait instead of duplicating
+    # the call, and a failed call is not cached so the next worker retries
+    openers: dict[str, str] = {}
+    opener_locks: dict[str, threading.Lock] = {}
+
+    def topic_opener(topic_name: str) -> str:
+        with opener_locks.setdefault(topic_name, threading.Lock()):
+            if topic_name not in openers:
+                openers[topic_name] = llm.generate_opener(topic_name)
+            return openers[topic_name]
+
     def process_task(task):
         student, topic = task
         sid = student["id"]
         name = student.get("name", sid)
+        if (sid, topic["id"]) in journaled:
+            return journaled[(sid, topic["id"])]
         trace_events: list[dict[str, str]] = []
         try:
-            log.info(f"=== Student: {name} - {topic['name']} ===")
+            log.info("=== Student: %s - %s ===", name, topic["name"])
             level = run_conversation(
-                llm, api, db, trace_events, sid, name, topic, args.turns
+                llm, api, db, trace_events, sid, name, topic, args.turns, topic_opener,
+                resume,
             )
             result = {
                 "student_id": sid,
@@ -327,38 +469,47 @@ def run_batch(
                 "predicted_level": level,
             }
         except Exception as e:
-            log.error(f"Error for {sid}/{topic['id']}: {e}")
+            log.error("Error for %s/%s: %s", sid, topic["id"], e)
             result = {
                 "student_id": sid,
                 "topic_id": topic["id"],
                 "predicted_level": 3,  # Default fallback
             }
+        else:
+            # Only real results are journaled; failed tasks are retried on --resume
+            with journal_lock:
+                predictions_journal.write(orjson.dumps(result) + b"\n")
+                predictions_journal.flush()
         finally:
             if trace_events:
                 with trace_lock:
                     trace_store.append_events(sid, trace_events)
         return result
 
-    if parallel > 1:
-        import concurrent.futures
+    with predictions_journal:
+        if parallel > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=actual_parallel) as executor:
+                predictions = list(executor.map(process_task, tasks))
+        else:
+            for task in tasks:
+                predictions.append(process_task(task))
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=actual_parallel) as executor:
-            predictions = list(executor.map(process_task, tasks))
-    else:
-        for task in tasks:
-            predictions.append(process_task(task))
+    # Fold this run's journaled traces into the snapshot so the journal stays short
+    with trace_lock:
+        trace_store.compact()
 
-    # Save predictions
-    Path("data").mkdir(exist_ok=True)
-    with open("data/predictions.json", "w") as f:
-        json.dump(predictions, f, indent=2)
-    log.info(f"Saved {len(predictions)} predictions to data/predictions.json")
+    # Save predictions (in task order); the journal is only needed until then
+    Path("data/predictions.json").write_bytes(
+        orjson.dumps(predictions, option=orjson.OPT_INDENT_2)
+    )
+    predictions_journal_path.unlink()
+    log.info("Saved %d predictions to data/predictions.json", len(predictions))
 
     # Optional: submit
     if args.submit:
         result = api.submit_predictions(predictions, args.set_type)
         mse = result.get("mse_score")
-        log.info(f"MSE Score: {mse}")
+        log.info("MSE Score: %s", mse)
 
         # ========== FEEDBACK LOOP: Log submission history ==========
         from datetime import datetime
@@ -367,7 +518,7 @@ def run_batch(
 
         # Load existing history
         if history_path.exists():
-            history = json.loads(history_path.read_text())
+            history = orjson.loads(history_path.read_bytes())
         else:
             history = {"submissions": []}
 
@@ -389,15 +540,17 @@ def run_batch(
             }
         )
 
-        history_path.write_text(json.dumps(history, indent=2))
+        history_path.write_bytes(orjson.dumps(history, option=orjson.OPT_INDENT_2))
         log.info(
-            f"Logged submission #{len(history['submissions'])} "
-            "to submission_history.json"
+            "Logged submission #%d to submission_history.json", len(history["submissions"])
         )
     return predictions
 
 
 def main():
+    settings = get_settings()
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(levelname)s: %(message)s")
+
     parser = argparse.ArgumentParser(description="AI Tutor")
     parser.add_argument(
         "--turns",
@@ -423,19 +576,33 @@ def main():
         default=1,
         help="Number of parallel conversations (default: 1 = sequential)",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue saved conversations from their last turn instead of restarting",
+    )
+    parser.add_argument(
+        "--qpm",
+        type=float,
+        default=0,
+        help="Max OpenAI requests per minute across all workers (0 = unlimited)",
+    )
     args = parser.parse_args()
 
     log.info(
-        f"Config: set_type={args.set_type}, turns={args.turns}, "
-        f"max_convos={args.max_convos or 'all'}, parallel={args.parallel}"
+        "Config: set_type=%s, turns=%s, max_convos=%s, parallel=%s",
+        args.set_type, args.turns, args.max_convos or "all", args.parallel,
     )
 
-    llm = LLMService()
+    llm = LLMService(rate_limiter=RateLimiter(args.qpm) if args.qpm > 0 else None)
     api = KnowunityClient()
     db = DatabaseService(set_type=args.set_type)
     trace_store = TraceStore()
 
-    return run_batch(llm, api, db, trace_store, args)
+    try:
+        return run_batch(llm, api, db, trace_store, args)
+    finally:
+        api.close()
 
 
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ class DetectiveOutput(BaseModel):
     estimated_level: int = Field(ge=1, le=5)
     confidence: float = Field(ge=0.0, le=1.0)
     next_message: str
+    verified_correct: Optional[bool] = None  # Independent re-check of is_correct
 
 
 class DiagnosticEvent(BaseModel):
@@ -44,3 +45,5 @@ class StudentState(BaseModel):
     diagnostic_events: List[DiagnosticEvent] = []  # Per-turn evidence log
     level_locked: bool = False
     switch_reason: Optional[str] = None  # "confidence" | "shot_clock"
+    conversation_id: Optional[str] = None  # Knowunity conversation, for --resume
+    conversation_complete: bool = False  # API reported the conversation finished
@@ -1,5 +1,9 @@
 """System prompts for the AI tutor - Optimized with GPT-5.2 patterns."""
 
+from src.models import Message
+
+HISTORY_WINDOW = 4  # Recent messages shown to the LLM (2 tutor/student pairs)
+
 OPENER = """<task>
 Generate a "Conceptual Trap" question for: {topic}
 </task>
@@ -37,12 +41,6 @@ Focus on MOST RECENT response. Use history only for consistency/contradiction.
 Do NOT generate teaching content.
 </task>
 
-<context>
-Topic: {topic}
-History: {history}
-Student's LATEST: "{response}"
-</context>
-
 <level_rubric>
 1: Struggling - "I don't know", random guesses, can't explain basics
 2: Below grade - knows vocabulary but applies wrong, inconsistent
@@ -89,7 +87,19 @@ BAD (interrogation): "What is the definition of a function?"
 GOOD (tutoring + diagnostic): "Interesting! What do you think happens when x equals zero here?"
 
 Make it feel like a conversation, not an exam.
-</next_message_rules>"""
+</next_message_rules>
+
+<output_rules>
+Return JSON matching the DetectiveOutput schema.
+next_message must be the literal text the student will see. Do NOT write instructions like "Ask the student to..." - write the actual question or teaching content directly.
+verified_correct: re-check ONLY whether the student's LATEST answer is factually correct, as if you had not judged it above. It may disagree with is_correct.
+</output_rules>
+
+<context>
+Topic: {topic}
+History: {history}
+Student's LATEST: "{response}"
+</context>"""
 
 
 TUTOR_COACH = """<task>
@@ -183,13 +193,31 @@ Student said: "{response}"
 </output_constraints>"""
 
 
-def get_tutor_prompt(level: int) -> str:
-    """Return the appropriate tutor prompt based on student level."""
-    if level <= 2:
-        return TUTOR_COACH
-    elif level <= 4:
-        return TUTOR_PROFESSOR
-    else:
-        return TUTOR_COLLEAGUE
+# Indexed by level 1-5 (index 0 is unused)
+TUTOR_PROMPTS_BY_LEVEL = (
+    TUTOR_COACH,
+    TUTOR_COACH,
+    TUTOR_COACH,
+    TUTOR_PROFESSOR,
+    TUTOR_PROFESSOR,
+    TUTOR_COLLEAGUE,
+)
 
 
+def get_tutor_prompt(level: int) -> str:
+    """Return the appropriate tutor prompt based on student level."""
+    return TUTOR_PROMPTS_BY_LEVEL[max(1, min(5, level))]
+
+
+def render_history(history: list[Message], k: int = HISTORY_WINDOW) -> str:
+    """Render the opener plus the last k messages for a prompt's {history} slot."""
+    if not history:
+        return "(no previous messages)"
+    lines = [f"{m.role}: {m.content}" for m in history[:1]]
+    # The opener's trap question anchors the whole session, so it always stays
+    recent = history[1:]
+    if len(recent) > k:
+        lines.append(f"({len(recent) - k} earlier messages omitted)")
+        recent = recent[-k:]
+    lines.extend(f"{m.role}: {m.content}" for m in recent)
+    return "\n".join(lines)
@@ -1,8 +1,11 @@
 """Simple JSON-based state persistence with per-student-topic files."""
 
-import json
+import os
 from pathlib import Path
 from typing import Optional
+
+import orjson
+
 from src.models import StudentState
 
 
@@ -38,8 +41,7 @@ class DatabaseService:
         path = self._state_path(student_id, topic_id)
         if path.exists():
             try:
-                data = json.loads(path.read_text())
-                return StudentState(**data)
+                return StudentState.model_validate_json(path.read_bytes())
             except Exception:
                 pass  # Corrupted file, return None
         return None
@@ -47,7 +49,10 @@ class DatabaseService:
     def save_state(self, state: StudentState):
         """Persist current state to student-topic file."""
         path = self._state_path(state.student_id, state.topic_id)
-        path.write_text(json.dumps(state.model_dump(), indent=2))
+        # Write then rename, so the dashboard never reads a half-written file
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(orjson.dumps(state.model_dump(), option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, path)
     
     def get_prediction(self, student_id: str, topic_id: str) -> Optional[int]:
         """Get saved level prediction."""
@@ -59,7 +64,7 @@ class DatabaseService:
         predictions = []
         for state_file in self.data_dir.glob("state_*.json"):
             try:
-                data = json.loads(state_file.read_text())
+                data = orjson.loads(state_file.read_bytes())
                 predictions.append({
                     "student_id": data["student_id"],
                     "topic_id": data["topic_id"],
@@ -1,85 +1,77 @@
 """OpenAI LLM service - Maximized for quality."""
 
-import json
+from functools import lru_cache
+
+from pydantic import BaseModel, ValidationError
+
 from openai import OpenAI
-from src.config import settings
-from src.models import DetectiveOutput, StudentState, Message
-from src.prompts import OPENER, DETECTIVE, get_tutor_prompt
+from src.config import get_settings
+from src.models import DetectiveOutput, StudentState
+from src.prompts import OPENER, DETECTIVE, get_tutor_prompt, render_history
+from src.services.rate_limiter import RateLimiter
+
+
+LLM_CACHE_SIZE = 1024
 
 
 class LLMService:
-    def __init__(self):
+    def __init__(self, rate_limiter: RateLimiter | None = None):
+        settings = get_settings()
         self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.pro_model = "gpt-5.2-pro"
+        self.pro_model = settings.OPENAI_MODEL
+        # Paces actual API calls only; cache hits are not counted
+        self.rate_limiter = rate_limiter
+        # Exact-prompt cache: students on the same topic share an opener and
+        # often give identical short answers, so identical prompts recur
+        self._complete = lru_cache(maxsize=LLM_CACHE_SIZE)(self._complete_uncached)
 
-    def _format_history(self, history: list[Message]) -> str:
-        if not history:
-            return "(no previous messages)"
-        return "\n".join(f"{m.role}: {m.content}" for m in history)
+    def _complete_uncached(
+        self, model: str, prompt: str, effort: str, text_format: type[BaseModel] | None = None
+    ) -> str:
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if text_format is not None:
+            # Schema-constrained decoding: the model can only emit valid JSON
+            response = self.client.responses.parse(
+                model=model,
+                input=prompt,
+                reasoning={"effort": effort},
+                text_format=text_format
+            )
+        else:
+            response = self.client.responses.create(
+                model=model,
+                input=prompt,
+                reasoning={"effort": effort}
+            )
+        return response.output_text
 
     def generate_opener(self, topic: str) -> str:
         """Generate opening trap question."""
-        response = self.client.responses.create(
-            model=self.pro_model,
-            input=OPENER.format(topic=topic),
-            reasoning={"effort": "high"}
-        )
-        return response.output_text
+        return self._complete(self.pro_model, OPENER.format(topic=topic), "high")
 
     def analyze(self, state: StudentState, student_response: str) -> DetectiveOutput:
         """Analyze student response, return structured data."""
         prompt = DETECTIVE.format(
             topic=state.topic_name,
-            history=self._format_history(state.history),
+            history=render_history(state.history),
             response=student_response
         )
-        json_prompt = prompt + """
-
-Return ONLY valid JSON:
-{
-  "is_correct": bool,
-  "reasoning_score": 1-5,
-  "misconception": string or null,
-  "estimated_level": 1-5,
-  "confidence": 0.0-1.0,
-  "next_message": "The ACTUAL message to send to the student. NOT an instruction. Write exactly what the student should read."
-}
-
-CRITICAL: "next_message" must be the literal text the student will see. Do NOT write instructions like "Ask the student to..." - write the actual question or teaching content directly."""
-        
-        response = self.client.responses.create(
-            model=self.pro_model,
-            input=json_prompt,
-            reasoning={"effort": "high"}
-        )
-        
-        # Robust JSON parsing with fallback
-        raw_text = response.output_text
         try:
-            data = json.loads(raw_text)
-        except json.JSONDecodeError:
-            # Sanitize common escape issues and retry
-            import re
-            # Extract JSON from markdown code blocks if present
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', raw_text)
-            if json_match:
-                raw_text = json_match.group(1)
-            # Fix common escape issues
-            raw_text = raw_text.replace('\\"', '"').replace("\\'", "'")
-            raw_text = re.sub(r'\\(?!["\\/bfnrt])', r'\\\\', raw_text)  # Fix invalid escapes
-            try:
-                data = json.loads(raw_text)
-            except json.JSONDecodeError:
-                # Ultimate fallback: return safe defaults
-                data = {
-                    "is_correct": False,
-                    "reasoning_score": 3,
-                    "misconception": None,
-                    "estimated_level": 3,
-                    "confidence": 0.5,
-                    "next_message": "Let's continue. Can you tell me more about your thinking?"
-                }
-        return DetectiveOutput(**data)
+            # responses.parse validates against the schema itself, so truncated
+            # output already raises inside _complete
+            raw_text = self._complete(self.pro_model, prompt, "high", DetectiveOutput)
+            return DetectiveOutput.model_validate_json(raw_text)
+        except ValidationError:
+            # Refusals and truncated output carry no usable JSON: return safe defaults
+            return DetectiveOutput(
+                is_correct=False,
+                reasoning_score=3,
+                misconception=None,
+                estimated_level=3,
+                confidence=0.5,
+                next_message="Let's continue. Can you tell me more about your thinking?"
+            )
 
     def tutor(self, state: StudentState, student_response: str) -> str:
         """Generate tutoring response with level-adaptive persona."""
@@ -88,27 +80,19 @@ CRITICAL: "next_message" must be the literal text the student will see. Do NOT w
             level=state.estimated_level,
             topic=state.topic_name,
             misconceptions=", ".join(state.misconceptions) or "none identified",
-            history=self._format_history(state.history),
+            history=render_history(state.history),
             response=student_response
         )
-        response = self.client.responses.create(
-            model=self.pro_model,
-            input=prompt,
-            reasoning={"effort": "medium"}
-        )
-        return response.output_text
+        return self._complete(self.pro_model, prompt, "medium")
 
     def verify_correctness(self, topic: str, student_response: str) -> bool:
         """Ultra-fast correctness check using lighter model."""
         # Minimal prompt for speed
         prompt = f"Topic: {topic}\nStudent: {student_response}\n\nIs this factually correct? Reply: true or false"
         
-        response = self.client.responses.create(
-            model="gpt-5.2",  # Faster non-pro model for simple check
-            input=prompt,
-            reasoning={"effort": "medium"}
-        )
-        return response.output_text.strip().lower() == "true"
+        # Faster non-pro model for simple check
+        output = self._complete("gpt-5.2", prompt, "medium")
+        return output.strip().lower() == "true"
 
 
     def analyze_with_verification(self, state: StudentState, student_response: str) -> DetectiveOutput:
@@ -117,6 +101,11 @@ CRITICAL: "next_message" must be the literal text the student will see. Do NOT w
         
         # Only double-check in NARROW ambiguity zone (reduces extra calls)
         if 0.50 <= result1.confidence <= 0.65:
+            # The Detective already re-checked correctness in the same call;
+            # only ask the separate verifier when that re-check disagrees
+            if result1.verified_correct == result1.is_correct:
+                return result1
+
             # Verify correctness separately
             verified_correct = self.verify_correctness(state.topic_name, student_response)
             
@@ -128,7 +117,8 @@ CRITICAL: "next_message" must be the literal text the student will see. Do NOT w
                     misconception=result1.misconception if not verified_correct else None,
                     estimated_level=result1.estimated_level,
                     confidence=result1.confidence,
-                    next_message=result1.next_message
+                    next_message=result1.next_message,
+                    verified_correct=verified_correct
                 )
         
         return result1
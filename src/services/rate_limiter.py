@@ -0,0 +1,30 @@
+"""Request pacing for rate-limited APIs."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Space calls evenly to stay under a queries-per-minute budget.
+
+    Thread-safe: parallel workers share one limiter, and each ``acquire``
+    reserves the next free slot before sleeping until it.
+    """
+
+    def __init__(self, qpm: float):
+        if qpm <= 0:
+            raise ValueError("qpm must be positive")
+        self.interval = 60.0 / qpm
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """Block until the caller may issue its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 
 def load_submission_history(path: str | Path) -> dict[str, Any]:
     """Load submission history from disk."""
@@ -13,8 +14,8 @@ def load_submission_history(path: str | Path) -> dict[str, Any]:
     if not history_path.exists():
         return {"submissions": []}
     try:
-        data = json.loads(history_path.read_text())
-    except json.JSONDecodeError:
+        data = orjson.loads(history_path.read_bytes())
+    except orjson.JSONDecodeError:
         return {"submissions": []}
     if not isinstance(data, dict):
         return {"submissions": []}
@@ -2,47 +2,117 @@
 
 from __future__ import annotations
 
-import json
+import os
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 
 class TraceStore:
-    """Store agent trace events in a JSON file."""
+    """Store agent trace events in a JSON snapshot plus an append-only journal.
+
+    ``append_events`` writes one JSON line per call to ``<name>.jsonl`` next to
+    the snapshot, so appending never rewrites earlier traces. ``compact``
+    (called at the end of each CLI run) and ``update_student`` fold the
+    journal back into the snapshot.
+    """
 
     def __init__(self, path: str | Path = "data/agent_traces.json"):
         self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".jsonl")
+        # The journal being folded in; renamed aside so new appends start a new file
+        self.pending_path = self.path.with_suffix(".jsonl.compacting")
         self.path.parent.mkdir(exist_ok=True)
 
-    def load(self) -> dict[str, list[dict[str, str]]]:
-        """Load stored traces from disk."""
+    def load_snapshot(self) -> dict[str, list[dict[str, str]]]:
+        """Load the compacted snapshot, ignoring journaled appends."""
         if not self.path.exists():
             return {}
         try:
-            data: Any = json.loads(self.path.read_text())
-        except json.JSONDecodeError:
+            data: Any = orjson.loads(self.path.read_bytes())
+        except orjson.JSONDecodeError:
             return {}
         return data if isinstance(data, dict) else {}
 
-    def save(self, traces: dict[str, list[dict[str, str]]]) -> None:
-        """Write traces to disk."""
-        self.path.write_text(json.dumps(traces, indent=2))
+    def load_since(
+        self, offset: int = 0
+    ) -> tuple[list[tuple[str, list[dict[str, str]]]], int]:
+        """Read journaled appends after a byte offset.
+
+        Returns the ``(student_id, events)`` records and the offset just past
+        the last complete line, so a partially written line is picked up by
+        the next call.
+        """
+        try:
+            with self.journal_path.open("rb") as journal:
+                journal.seek(offset)
+                chunk = journal.read()
+        except FileNotFoundError:
+            return [], 0
+        end = chunk.rfind(b"\n") + 1
+        return self._parse_records(chunk[:end]), offset + end
+
+    @staticmethod
+    def _parse_records(chunk: bytes) -> list[tuple[str, list[dict[str, str]]]]:
+        records: list[tuple[str, list[dict[str, str]]]] = []
+        for line in chunk.splitlines():
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            records.append((record["student_id"], record["events"]))
+        return records
+
+    def load(self) -> dict[str, list[dict[str, str]]]:
+        """Load stored traces from disk."""
+        traces = self.load_snapshot()
+        records, _ = self.load_since(0)
+        try:
+            # Events of a compaction that has not finished come before the journal
+            records = self._parse_records(self.pending_path.read_bytes()) + records
+        except FileNotFoundError:
+            pass
+        for student_id, events in records:
+            traces.setdefault(student_id, []).extend(events)
+        return traces
+
+    def _write_snapshot(self, traces: dict[str, list[dict[str, str]]]) -> None:
+        # Write then rename, so readers never see a half-written snapshot
+        tmp_path = self.path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(orjson.dumps(traces, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, self.path)
+
+    def compact(self) -> dict[str, list[dict[str, str]]]:
+        """Fold the journal into the snapshot and return the compacted traces.
+
+        The journal is renamed aside before it is read, so events appended
+        meanwhile land in a fresh journal instead of being deleted with it.
+        A pending journal left by an interrupted compaction is folded first.
+        """
+        traces = self.load_snapshot()
+        if not self.pending_path.exists():
+            try:
+                os.replace(self.journal_path, self.pending_path)
+            except FileNotFoundError:
+                return traces
+        for student_id, events in self._parse_records(self.pending_path.read_bytes()):
+            traces.setdefault(student_id, []).extend(events)
+        self._write_snapshot(traces)
+        self.pending_path.unlink()
+        return traces
 
     def update_student(
         self, student_id: str, trace: list[dict[str, str]]
     ) -> dict[str, list[dict[str, str]]]:
         """Update a student's trace and return merged data."""
-        traces = self.load()
+        traces = self.compact()
         traces[student_id] = trace
-        self.save(traces)
+        self._write_snapshot(traces)
         return traces
 
-    def append_events(
-        self, student_id: str, events: list[dict[str, str]]
-    ) -> dict[str, list[dict[str, str]]]:
-        """Append events to a student's trace and return merged data."""
-        traces = self.load()
-        traces.setdefault(student_id, [])
-        traces[student_id].extend(events)
-        self.save(traces)
-        return traces
+    def append_events(self, student_id: str, events: list[dict[str, str]]) -> None:
+        """Append events to a student's trace without rewriting stored traces."""
+        record = orjson.dumps({"student_id": student_id, "events": events})
+        with self.journal_path.open("ab") as journal:
+            journal.write(record + b"\n")
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Sequence
 
 import re
 
+# Any line parse_agent_trace acts on contains one of these markers.
+TRACE_MARKER_PATTERN = re.compile(
+    r"Starting: |\[Turn 0\] Tutor:|\[DIAGNOSIS Turn|\[TUTORING Turn|>>> SHOT CLOCK|>>> Level FROZEN"
+)
+DIAGNOSIS_METRICS_PATTERN = re.compile(r"Level=(\d+).*Conf=([0-9.]+)")
+
 
 def parse_agent_trace(log_lines: Iterable[str]) -> list[dict[str, str]]:
     """Parse run logs into agent activity events."""
@@ -13,9 +19,9 @@ def parse_agent_trace(log_lines: Iterable[str]) -> list[dict[str, str]]:
     current_topic = ""
 
     for raw_line in log_lines:
-        line = raw_line.strip()
-        if not line:
+        if not TRACE_MARKER_PATTERN.search(raw_line):
             continue
+        line = raw_line.strip()
 
         if "Starting: " in line:
             current_topic = line.split("Starting: ", 1)[1].strip()
@@ -73,12 +79,11 @@ def extract_diagnosis_metrics(
 ) -> list[dict[str, float]]:
     """Extract level/confidence sequences from detective trace details."""
     metrics: list[dict[str, float]] = []
-    pattern = re.compile(r"Level=(\d+).*Conf=([0-9.]+)")
     for event in trace:
         if event.get("agent") != "Detective":
             continue
         detail = event.get("detail", "")
-        match = pattern.search(detail)
+        match = DIAGNOSIS_METRICS_PATTERN.search(detail)
         if not match:
             continue
         level = float(match.group(1))
@@ -91,9 +96,50 @@ def extract_diagnosis_metrics(
 
 def find_switch_event(trace: Iterable[dict[str, str]]) -> dict[str, str] | None:
     """Return the most relevant switch event (confidence gate preferred)."""
-    trace_list = list(trace)
-    for agent_name in ("Confidence Gate", "Shot Clock"):
-        matches = [event for event in trace_list if event.get("agent") == agent_name]
-        if matches:
-            return matches[-1]
-    return None
+    events = trace if isinstance(trace, Sequence) else list(trace)
+    shot_clock: dict[str, str] | None = None
+    for event in reversed(events):
+        agent = event.get("agent")
+        if agent == "Confidence Gate":
+            return event
+        if agent == "Shot Clock" and shot_clock is None:
+            shot_clock = event
+    return shot_clock
+
+
+def first_and_last_tutor_messages(history: Iterable[dict[str, str]]) -> tuple[str, str]:
+    """Return the first and latest tutor message contents in one pass."""
+    opener = latest = ""
+    seen_tutor = False
+    for message in history:
+        if message.get("role") != "tutor":
+            continue
+        latest = message.get("content", "")
+        if not seen_tutor:
+            opener = latest
+            seen_tutor = True
+    return opener, latest
+
+
+def summarize_agent_activity(
+    trace: Sequence[dict[str, str]],
+    agent_names: Iterable[str],
+    topic: str | None = None,
+) -> tuple[dict[str, dict[str, str]], Sequence[dict[str, str]]]:
+    """Return the latest event per agent and the trace filtered to a topic.
+
+    Without a topic the trace itself is returned rather than a copy.
+    """
+    targets = frozenset(agent_names)
+    if topic is None:
+        filtered = trace
+    else:
+        filtered = [event for event in trace if event.get("topic") == topic]
+    last_by_agent: dict[str, dict[str, str]] = {}
+    for event in reversed(filtered):
+        agent = event.get("agent", "")
+        if agent in targets and agent not in last_by_agent:
+            last_by_agent[agent] = event
+            if len(last_by_agent) == len(targets):
+                break
+    return last_by_agent, filtered
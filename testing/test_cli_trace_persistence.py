@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import argparse
+import json
+
+import httpx
+import pytest
 
 from src.main import run_batch
 from src.models import DetectiveOutput
@@ -75,3 +79,242 @@ def test_cli_run_saves_agent_traces(tmp_path, monkeypatch):
     agents = [event["agent"] for event in stored["student-1"]]
     assert "Opener" in agents
     assert "Detective" in agents
+    assert not trace_store.journal_path.exists()
+
+
+def test_cli_run_generates_one_opener_per_topic(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class CountingLLM(FakeLLM):
+        def __init__(self) -> None:
+            self.opener_topics: list[str] = []
+
+        def generate_opener(self, topic_name: str) -> str:
+            self.opener_topics.append(topic_name)
+            return super().generate_opener(topic_name)
+
+    class TwoStudentAPI(FakeAPI):
+        def list_students(self, set_type: str):
+            return [
+                {"id": "student-1", "name": "Student One"},
+                {"id": "student-2", "name": "Student Two"},
+            ]
+
+    args = argparse.Namespace(
+        turns=3,
+        max_convos=0,
+        set_type="mini_dev",
+        student_id=None,
+        submit=False,
+        parallel=2,
+    )
+    llm = CountingLLM()
+    db = DatabaseService(data_dir=str(tmp_path))
+    trace_store = TraceStore(tmp_path / "agent_traces.json")
+
+    predictions = run_batch(llm, TwoStudentAPI(), db, trace_store, args)
+
+    assert len(predictions) == 2
+    assert llm.opener_topics == ["Linear Functions"]
+    stored = trace_store.load()
+    assert stored["student-1"][0]["detail"] == stored["student-2"][0]["detail"]
+
+
+def test_cli_run_journals_predictions_until_saved(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class Interrupted(BaseException):
+        """Stands in for a crash that process_task does not catch."""
+
+    class InterruptingLLM(FakeLLM):
+        def generate_opener(self, topic_name: str) -> str:
+            if topic_name == "Quadratics":
+                raise Interrupted
+            return super().generate_opener(topic_name)
+
+    class TwoTopicAPI(FakeAPI):
+        def get_topics(self, student_id: str):
+            return [
+                {"id": "topic-1", "name": "Linear Functions"},
+                {"id": "topic-2", "name": "Quadratics"},
+            ]
+
+    args = argparse.Namespace(
+        turns=3,
+        max_convos=0,
+        set_type="mini_dev",
+        student_id=None,
+        submit=False,
+        parallel=1,
+    )
+    db = DatabaseService(data_dir=str(tmp_path))
+    trace_store = TraceStore(tmp_path / "agent_traces.json")
+
+    with pytest.raises(Interrupted):
+        run_batch(InterruptingLLM(), TwoTopicAPI(), db, trace_store, args)
+
+    journal_path = tmp_path / "data" / "predictions.jsonl"
+    journal = journal_path.read_text().splitlines()
+    assert [json.loads(line)["topic_id"] for line in journal] == ["topic-1"]
+    assert not (tmp_path / "data" / "predictions.json").exists()
+
+    class RecordingAPI(TwoTopicAPI):
+        def __init__(self) -> None:
+            super().__init__()
+            self.started: list[str] = []
+
+        def start_conversation(self, student_id: str, topic_id: str):
+            self.started.append(topic_id)
+            return super().start_conversation(student_id, topic_id)
+
+    # A record torn by the crash is discarded; finished tasks are not rerun
+    with journal_path.open("a") as journal_file:
+        journal_file.write('{"student_id": "student-1", "topic')
+    api = RecordingAPI()
+    run_batch(FakeLLM(), api, db, trace_store, argparse.Namespace(**vars(args), resume=True))
+
+    assert api.started == ["topic-2"]
+    assert not journal_path.exists()
+    saved = json.loads((tmp_path / "data" / "predictions.json").read_text())
+    assert [prediction["topic_id"] for prediction in saved] == ["topic-1", "topic-2"]
+
+    # Without --resume a new run starts over
+    with pytest.raises(Interrupted):
+        run_batch(InterruptingLLM(), TwoTopicAPI(), db, trace_store, args)
+    api = RecordingAPI()
+    run_batch(FakeLLM(), api, db, trace_store, args)
+    assert api.started == ["topic-1", "topic-2"]
+
+
+def test_cli_resume_skips_unreadable_journal_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class RecordingTwoTopicAPI(FakeAPI):
+        def __init__(self) -> None:
+            super().__init__()
+            self.started: list[str] = []
+
+        def get_topics(self, student_id: str):
+            return [
+                {"id": "topic-1", "name": "Linear Functions"},
+                {"id": "topic-2", "name": "Quadratics"},
+            ]
+
+        def start_conversation(self, student_id: str, topic_id: str):
+            self.started.append(topic_id)
+            return super().start_conversation(student_id, topic_id)
+
+    journal_path = tmp_path / "data" / "predictions.jsonl"
+    journal_path.parent.mkdir()
+    journal_path.write_text(
+        '{"student_id": "student-1", "topic_id": "topic-1", "predicted_level": 4}\n'
+        '{"student_id": "student-1", "topic_id": "topic-2", "predic\n'
+        '{"student_id": "student-1", "predicted_level": 2}\n'
+        "[1, 2]\n"
+    )
+    args = argparse.Namespace(
+        turns=3,
+        max_convos=0,
+        set_type="mini_dev",
+        student_id=None,
+        submit=False,
+        parallel=1,
+        resume=True,
+    )
+    db = DatabaseService(data_dir=str(tmp_path))
+    api = RecordingTwoTopicAPI()
+
+    predictions = run_batch(FakeLLM(), api, db, TraceStore(tmp_path / "agent_traces.json"), args)
+
+    assert api.started == ["topic-2"]
+    assert [(p["topic_id"], p["predicted_level"]) for p in predictions] == [
+        ("topic-1", 4),
+        ("topic-2", 3),
+    ]
+
+
+def test_cli_resume_continues_saved_conversation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class DroppedConnection(Exception):
+        """The API failing partway through a conversation."""
+
+    class FlakyAPI(FakeAPI):
+        def interact(self, conversation_id: str, tutor_message: str):
+            if self._calls == 2:
+                raise DroppedConnection
+            self._calls += 1
+            return {"student_response": "Student response", "is_complete": False}
+
+    class ResumedAPI(FakeAPI):
+        def start_conversation(self, student_id: str, topic_id: str):
+            raise AssertionError("resume must reuse the saved conversation")
+
+        def interact(self, conversation_id: str, tutor_message: str):
+            assert conversation_id == "conv-1"
+            return {"student_response": "Student response", "is_complete": True}
+
+    args = argparse.Namespace(
+        turns=5,
+        max_convos=0,
+        set_type="mini_dev",
+        student_id=None,
+        submit=False,
+        parallel=1,
+        resume=True,
+    )
+    db = DatabaseService(data_dir=str(tmp_path))
+    trace_store = TraceStore(tmp_path / "agent_traces.json")
+
+    run_batch(FakeLLM(), FlakyAPI(), db, trace_store, args)
+    interrupted = db.get_state("student-1", "topic-1")
+    assert interrupted.conversation_id == "conv-1"
+    assert interrupted.turn_count == 2
+
+    run_batch(FakeLLM(), ResumedAPI(), db, trace_store, args)
+
+    resumed = db.get_state("student-1", "topic-1")
+    assert resumed.turn_count == 3
+    assert resumed.conversation_complete
+    assert len(resumed.diagnostic_events) == 2
+    assert resumed.history[:4] == interrupted.history
+
+
+def test_cli_resume_restarts_expired_conversation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class ExpiredAPI(FakeAPI):
+        def start_conversation(self, student_id: str, topic_id: str):
+            return {"conversation_id": "conv-2"}
+
+        def interact(self, conversation_id: str, tutor_message: str):
+            if conversation_id == "conv-1":
+                request = httpx.Request("POST", "https://example.test/interact")
+                raise httpx.HTTPStatusError(
+                    "Not Found", request=request, response=httpx.Response(404, request=request)
+                )
+            return super().interact(conversation_id, tutor_message)
+
+    args = argparse.Namespace(
+        turns=3,
+        max_convos=0,
+        set_type="mini_dev",
+        student_id=None,
+        submit=False,
+        parallel=1,
+        resume=True,
+    )
+    db = DatabaseService(data_dir=str(tmp_path))
+    trace_store = TraceStore(tmp_path / "agent_traces.json")
+    run_batch(FakeLLM(), FakeAPI(), db, trace_store, args)
+    assert db.get_state("student-1", "topic-1").conversation_complete
+    db.save_state(
+        db.get_state("student-1", "topic-1").model_copy(update={"conversation_complete": False})
+    )
+
+    run_batch(FakeLLM(), ExpiredAPI(), db, trace_store, args)
+
+    restarted = db.get_state("student-1", "topic-1")
+    assert restarted.conversation_id == "conv-2"
+    assert restarted.history[0].content == "Opener for Linear Functions"
+    assert restarted.turn_count == 2
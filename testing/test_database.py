@@ -0,0 +1,20 @@
+"""Tests for state persistence."""
+
+from src.models import Message, StudentState
+from src.services.database import DatabaseService
+
+
+def test_save_state_replaces_file_and_round_trips(tmp_path):
+    db = DatabaseService(data_dir=str(tmp_path))
+    state = StudentState(student_id="student-1", topic_id="topic-1", topic_name="Algebra")
+    db.save_state(state)
+
+    state.history.append(Message(role="tutor", content="Opening question"))
+    state.estimated_level = 4
+    db.save_state(state)
+
+    assert db.get_state("student-1", "topic-1") == state
+    assert [path.name for path in db.data_dir.iterdir()] == ["state_student-_topic-1.json"]
+    assert db.list_predictions() == [
+        {"student_id": "student-1", "topic_id": "topic-1", "predicted_level": 4}
+    ]
@@ -0,0 +1,32 @@
+"""Tests for LLM output handling."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.models import DetectiveOutput, StudentState
+from src.services.llm import LLMService
+
+TRUNCATED = '{"is_correct": true, "reasoning_score": 4, "misconc'
+
+
+def parse_like_sdk(**kwargs):
+    """Mimic responses.parse, which validates output against text_format."""
+    kwargs["text_format"].model_validate_json(TRUNCATED)
+
+
+@pytest.mark.parametrize(
+    "parse",
+    [parse_like_sdk, lambda **kwargs: SimpleNamespace(output_text=TRUNCATED)],
+    ids=["parse-raises", "truncated-text"],
+)
+def test_analyze_falls_back_to_defaults_on_bad_output(parse):
+    llm = LLMService()
+    llm.client = SimpleNamespace(responses=SimpleNamespace(parse=parse))
+    state = StudentState(student_id="student-1", topic_id="topic-1", topic_name="Algebra")
+
+    result = llm.analyze(state, "I think it's 4")
+
+    assert isinstance(result, DetectiveOutput)
+    assert result.estimated_level == 3
+    assert result.confidence == 0.5
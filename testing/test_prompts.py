@@ -0,0 +1,21 @@
+"""Tests for prompt helpers."""
+
+from src.models import Message
+from src.prompts import render_history
+
+
+def test_render_history_keeps_opener_and_last_k_messages():
+    history = [Message(role="tutor", content="Opener")]
+    for i in range(3):
+        history += [
+            Message(role="student", content=f"Answer {i}"),
+            Message(role="tutor", content=f"Follow-up {i}"),
+        ]
+
+    assert render_history(history[:3], k=4) == (
+        "tutor: Opener\nstudent: Answer 0\ntutor: Follow-up 0"
+    )
+    assert render_history(history, k=2) == (
+        "tutor: Opener\n(4 earlier messages omitted)\nstudent: Answer 2\ntutor: Follow-up 2"
+    )
+    assert render_history([]) == "(no previous messages)"
@@ -0,0 +1,33 @@
+"""Tests for request pacing."""
+
+import pytest
+
+from src.services import rate_limiter
+from src.services.rate_limiter import RateLimiter
+
+
+def test_rate_limiter_spaces_calls_by_qpm(monkeypatch):
+    clock = {"now": 100.0}
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(rate_limiter.time, "sleep", fake_sleep)
+    limiter = RateLimiter(qpm=120)
+
+    limiter.acquire()
+    limiter.acquire()
+    limiter.acquire()
+    assert sleeps == [0.5, 0.5]
+
+    clock["now"] += 10
+    limiter.acquire()
+    assert sleeps == [0.5, 0.5]
+
+
+def test_rate_limiter_rejects_non_positive_qpm():
+    with pytest.raises(ValueError):
+        RateLimiter(qpm=0)
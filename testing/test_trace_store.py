@@ -11,6 +11,13 @@ def test_trace_store_load_missing_returns_empty(tmp_path):
     assert store.load() == {}
 
 
+def test_trace_store_load_corrupt_returns_empty(tmp_path):
+    store = TraceStore(tmp_path / "agent_traces.json")
+    store.path.write_text("{not json")
+
+    assert store.load() == {}
+
+
 def test_trace_store_update_student_writes_and_merges(tmp_path):
     store = TraceStore(tmp_path / "agent_traces.json")
     trace_a = [{"agent": "Opener", "detail": "Hello", "topic": "Algebra"}]
@@ -34,5 +41,56 @@ def test_trace_store_append_events_extends_existing(tmp_path):
     store.append_events("student-a", trace_a)
     store.append_events("student-a", trace_b)
 
+    assert not store.path.exists()
+    assert store.load()["student-a"] == trace_a + trace_b
+
+
+def test_trace_store_load_since_reads_only_complete_new_lines(tmp_path):
+    store = TraceStore(tmp_path / "agent_traces.json")
+    trace_a = [{"agent": "Opener", "detail": "Hello", "topic": "Algebra"}]
+    trace_b = [{"agent": "Tutor", "detail": "Explain", "topic": "Algebra"}]
+
+    store.append_events("student-a", trace_a)
+    records, offset = store.load_since(0)
+    assert records == [("student-a", trace_a)]
+
+    store.append_events("student-b", trace_b)
+    with store.journal_path.open("ab") as journal:
+        journal.write(b'{"student_id": "student-c"')
+    records, next_offset = store.load_since(offset)
+    assert records == [("student-b", trace_b)]
+    assert store.load_since(next_offset) == ([], next_offset)
+
+
+def test_trace_store_update_student_compacts_journal(tmp_path):
+    store = TraceStore(tmp_path / "agent_traces.json")
+    trace_a = [{"agent": "Opener", "detail": "Hello", "topic": "Algebra"}]
+    trace_b = [{"agent": "Tutor", "detail": "Explain", "topic": "Geometry"}]
+
+    store.append_events("student-a", trace_a)
+    store.update_student("student-b", trace_b)
+
+    assert not store.journal_path.exists()
     data = json.loads(store.path.read_text())
-    assert data["student-a"] == trace_a + trace_b
+    assert data == {"student-a": trace_a, "student-b": trace_b}
+
+
+def test_trace_store_compact_folds_pending_journal_first(tmp_path):
+    store = TraceStore(tmp_path / "agent_traces.json")
+    trace_a = [{"agent": "Opener", "detail": "Hello", "topic": "Algebra"}]
+    trace_b = [{"agent": "Tutor", "detail": "Explain", "topic": "Algebra"}]
+
+    # An interrupted compaction left its journal aside; new events went on
+    store.append_events("student-a", trace_a)
+    store.journal_path.rename(store.pending_path)
+    store.append_events("student-a", trace_b)
+    assert store.load()["student-a"] == trace_a + trace_b
+
+    store.compact()
+    assert store.load_snapshot() == {"student-a": trace_a}
+    assert store.load()["student-a"] == trace_a + trace_b
+
+    store.compact()
+    assert not store.journal_path.exists()
+    assert not store.pending_path.exists()
+    assert store.load_snapshot() == {"student-a": trace_a + trace_b}
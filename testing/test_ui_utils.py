@@ -4,7 +4,9 @@ from src.ui_utils import (
     condense_trace_timeline,
     extract_diagnosis_metrics,
     find_switch_event,
+    first_and_last_tutor_messages,
     parse_agent_trace,
+    summarize_agent_activity,
 )
 
 
@@ -71,3 +73,48 @@ def test_find_switch_event_prefers_confidence_gate():
     event = find_switch_event(trace)
 
     assert event == {"agent": "Confidence Gate", "detail": "Frozen at 0.75", "topic": "X"}
+
+
+def test_find_switch_event_falls_back_to_latest_shot_clock():
+    trace = [
+        {"agent": "Shot Clock", "detail": "Turn 4", "topic": "X"},
+        {"agent": "Tutor", "detail": "Teaching", "topic": "X"},
+        {"agent": "Shot Clock", "detail": "Turn 6", "topic": "X"},
+    ]
+
+    assert find_switch_event(trace) == trace[2]
+    assert find_switch_event(iter(trace)) == trace[2]
+    assert find_switch_event([]) is None
+
+
+def test_first_and_last_tutor_messages_single_pass():
+    history = [
+        {"role": "tutor", "content": "Opening question"},
+        {"role": "student", "content": "Answer"},
+        {"role": "tutor", "content": "Follow-up"},
+        {"role": "student", "content": "Another answer"},
+    ]
+
+    assert first_and_last_tutor_messages(history) == ("Opening question", "Follow-up")
+    assert first_and_last_tutor_messages([]) == ("", "")
+
+
+def test_summarize_agent_activity_filters_topic_and_keeps_latest():
+    trace = [
+        {"agent": "Detective", "detail": "Level=2", "topic": "X"},
+        {"agent": "Detective", "detail": "Level=3", "topic": "Y"},
+        {"agent": "Detective", "detail": "Level=4", "topic": "X"},
+        {"agent": "Tutor", "detail": "Teaching", "topic": "Y"},
+    ]
+
+    last_by_agent, filtered = summarize_agent_activity(
+        trace, ("Detective", "Tutor"), topic="X"
+    )
+
+    assert last_by_agent == {"Detective": trace[2]}
+    assert filtered == [trace[0], trace[2]]
+
+    last_by_agent, unfiltered = summarize_agent_activity(trace, ("Detective", "Tutor"))
+
+    assert last_by_agent == {"Detective": trace[2], "Tutor": trace[3]}
+    assert unfiltered is trace